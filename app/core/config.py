@@ -1,7 +1,7 @@
 import os
 from pydantic_settings import BaseSettings
 from pydantic import AnyUrl
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # ---------------------------
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = ""  # Will be split later
     RATE_LIMIT: int = 1000
     LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    ACTION_LOG_BATCH_SIZE: int = 100
+    ACTION_LOG_FLUSH_INTERVAL_MS: int = 500
+    ACTION_LOG_MAX_QUEUE_SIZE: int = 10000
 
     # ---------------------------
     # Database Configuration
@@ -35,6 +39,9 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 43200
     PASSWORD_MIN_LENGTH: int = 8
+    JWT_CACHE_MAX_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
 
     # ---------------------------
     # Email Configuration
@@ -47,6 +54,14 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAIL_USE_TLS: bool = True
     EMAIL_TEMPLATES_DIR: str = "app/templates/email"
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    SMTP_POOL_SIZE: int = 4  # pooled connections = sender threads
+    SMTP_POOL_IDLE_TIMEOUT_SECONDS: int = 60  # close connections idle longer than this
+    SMTP_POOL_HEALTH_CHECK_AFTER_SECONDS: int = 10  # NOOP connections idle longer than this before reuse
+    SMTP_CA_FILE: str | None = None  # extra CA bundle, e.g. for a private relay
+    EMAIL_TRANSPORT: str = "async"  # "async" (asyncio, pipelined) or "thread" (smtplib on SMTP_POOL_SIZE threads)
+    SMTP_PIPELINE_MAX_BATCH: int = 20  # queued messages sent back to back per connection turn (async transport)
+    SMTP_ALLOW_PLAINTEXT: bool = False  # no TLS, optional AUTH; local stand-in servers only
 
     # ---------------------------
     # SMS Configuration
@@ -57,6 +72,12 @@ class Settings(BaseSettings):
     DIALOG_PASSWORD: str | None = None
     DIALOG_LOGIN_ENDPOINT: str | None = None
     DIALOG_SMS_ENDPOINT: str | None = None
+    DIALOG_TOKEN_TTL_SECONDS: int = 3000  # used when the login response carries no expiry
+    DIALOG_TOKEN_REFRESH_MARGIN_SECONDS: int = 60  # refresh this long before the token expires
+    SMS_HTTP_POOL_SIZE: int = 20  # keep-alive connections to the provider
+    SMS_HTTP_TIMEOUT_SECONDS: float = 10.0
+    SMS_MAX_CONCURRENCY: int = 10  # sends in flight to the provider; 0 = SMS_HTTP_POOL_SIZE
+    SMS_RATE_LIMIT_PER_SECOND: float = 20.0  # provider send rate cap; 0 = unlimited
 
     # ---------------------------
     # Firebase Configuration
@@ -79,10 +100,61 @@ class Settings(BaseSettings):
     # ---------------------------
     # Security Settings
     # ---------------------------
-    BCRYPT_ROUNDS: int = 12
+    BCRYPT_ROUNDS: int = 12  # tune per host with: python -m app.scripts.calibrate_bcrypt
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU core
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 0  # in-flight + queued hashes; 0 = 2 x workers
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
     SESSION_TIMEOUT_MINUTES: int = 30
     MAX_LOGIN_ATTEMPTS: int = 5
     LOCKOUT_DURATION_MINUTES: int = 15
+    LOGIN_ATTEMPT_WINDOW_MINUTES: int = 15
+    LOGIN_LOCKOUT_MAX_TRACKED: int = 100000
+    METRICS_TOKEN: str | None = None  # X-Metrics-Token for /api/health/metrics; unset = endpoint disabled
+    OTP_STORE_BACKEND: str = "sql"  # "sql" (durable) or "memory" (OTP requests make no DB writes, emails are sent in-process; single worker only)
+
+    # ---------------------------
+    # App Version Check
+    # ---------------------------
+    APP_VERSION_CACHE_TTL_SECONDS: int = 60
+
+    # ---------------------------
+    # Master Data
+    # ---------------------------
+    MASTER_DATA_SNAPSHOT_TTL_SECONDS: int = 60  # rebuild the pre-encoded responses at least this often
+
+    # ---------------------------
+    # HTTP Request Logging
+    # ---------------------------
+    HTTP_LOG_BODY_MAX_BYTES: int = 2048
+    HTTP_LOG_SAMPLE_RATE: float = 1.0
+    HTTP_LOG_ROUTE_SAMPLE_RATES: str = ""  # e.g. "/master-data/all=0.1,/auth/login=1"
+    HTTP_LOG_STATUS_SAMPLE_RATES: str = "4xx=1,5xx=1"  # exact codes ("404") or classes ("5xx")
+    HTTP_LOG_SKIP_BODY_CONTENT_TYPES: str = "multipart/,application/octet-stream,application/pdf,application/zip,image/,audio/,video/"
+
+    # ---------------------------
+    # Notification Outbox
+    # ---------------------------
+    NOTIFICATION_WORKERS: int = 2
+    NOTIFICATION_BATCH_SIZE: int = 20
+    NOTIFICATION_LEASE_SECONDS: int = 60  # a claimed batch is retried after this if its worker dies
+    NOTIFICATION_MAX_ATTEMPTS: int = 6  # then dead-lettered (status = 2)
+    NOTIFICATION_BACKOFF_BASE_SECONDS: float = 5.0
+    NOTIFICATION_BACKOFF_MAX_SECONDS: float = 900.0
+    NOTIFICATION_POLL_INTERVAL_SECONDS: float = 5.0
+
+    # ---------------------------
+    # Data Retention
+    # ---------------------------
+    OTP_PURGE_ENABLED: bool = True
+    OTP_PURGE_INTERVAL_SECONDS: int = 600
+    OTP_PURGE_BATCH_SIZE: int = 500
+    OTP_PURGE_BATCH_PAUSE_MS: int = 50
+    REFRESH_TOKEN_SWEEP_ENABLED: bool = True
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 900
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 500
+    REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_SECOND: int = 2000  # 0 = unlimited
+    REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_RUN: int = 200000
 
     # ---------------------------
     # Rate Limiting
@@ -113,5 +185,30 @@ class Settings(BaseSettings):
             return []
         return [ft.strip() for ft in self.ALLOWED_FILE_TYPES.split(",") if ft.strip()]
 
+    @property
+    def http_log_route_sample_rates(self) -> Dict[str, float]:
+        """Parse HTTP_LOG_ROUTE_SAMPLE_RATES into {path: rate}"""
+        return self._parse_rates(self.HTTP_LOG_ROUTE_SAMPLE_RATES)
+
+    @property
+    def http_log_status_sample_rates(self) -> Dict[str, float]:
+        """Parse HTTP_LOG_STATUS_SAMPLE_RATES into {status or class: rate}"""
+        return {k.lower(): v for k, v in self._parse_rates(self.HTTP_LOG_STATUS_SAMPLE_RATES).items()}
+
+    @property
+    def http_log_skip_body_content_types_list(self) -> List[str]:
+        """Parse HTTP_LOG_SKIP_BODY_CONTENT_TYPES string into list of prefixes"""
+        return [ct.strip().lower() for ct in self.HTTP_LOG_SKIP_BODY_CONTENT_TYPES.split(",") if ct.strip()]
+
+    @staticmethod
+    def _parse_rates(value: str) -> Dict[str, float]:
+        """Parse 'key=rate,key=rate' pairs, clamping rates to [0, 1]"""
+        rates = {}
+        for pair in value.split(","):
+            key, sep, rate = pair.partition("=")
+            if sep and key.strip():
+                rates[key.strip()] = min(max(float(rate), 0.0), 1.0)
+        return rates
+
 
 settings = Settings()
\ No newline at end of file
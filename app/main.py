@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+import hmac
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,6 +28,26 @@ from app.scripts.create_table_script import create_table_script
 # Seed
 from app.seed.seed import run_seeds
 
+# Logging
+from app.utils.logger import logger_stats, shutdown_logger
+from app.utils.action_logger import action_log_writer
+from app.utils.loop_monitor import event_loop_lag_monitor
+from app.utils.password_utils import password_hash_pool
+from app.utils.jwt_utils import verified_token_cache
+from app.modules.user.principal_cache import principal_cache
+from app.modules.auth.lockout import login_lockout
+from app.modules.auth.otp_store import in_memory_otp_store
+from app.modules.user.maintenance import otp_purge_task, refresh_token_sweep_task
+from app.utils.smtp_pool import smtp_pool
+from app.utils.async_smtp import async_smtp_pool
+from app.utils.email_templates import email_templates
+from app.modules.notification.dispatcher import notification_dispatcher
+from app.utils.sms_utils import dialog_client
+from app.modules.master_data.snapshot import master_data_snapshot
+
+# Caches
+from app.utils.version_cache import app_version_cache
+
 # Routes
 from app.modules.master_data import controllers as master_data_controller
 # from app.modules.user import controllers as user_controller
@@ -76,6 +98,40 @@ async def health_check():
     }
 
 
+@app.get("/api/health/metrics", include_in_schema=False)
+async def health_metrics(request: Request):
+    # Internal counters: disabled unless METRICS_TOKEN is set, then required as X-Metrics-Token
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-metrics-token", "")
+    if not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    return {
+        "success": True,
+        "message": "Service metrics.",
+        "data": {
+            "app_version_cache": app_version_cache.stats(),
+            "logger": logger_stats(),
+            "action_log_writer": action_log_writer.stats(),
+            "event_loop": event_loop_lag_monitor.stats(),
+            "password_hash_pool": password_hash_pool.stats(),
+            "jwt_cache": verified_token_cache.stats(),
+            "principal_cache": principal_cache.stats(),
+            "login_lockout": login_lockout.stats(),
+            "otp_store": {"backend": settings.OTP_STORE_BACKEND, **in_memory_otp_store.stats()},
+            "otp_purge": otp_purge_task.stats(),
+            "refresh_token_sweep": refresh_token_sweep_task.stats(),
+            "smtp_pool": smtp_pool.stats(),
+            "async_smtp_pool": async_smtp_pool.stats(),
+            "email_templates": email_templates.stats(),
+            "notification_dispatcher": notification_dispatcher.stats(),
+            "dialog_client": dialog_client.stats(),
+            "master_data_snapshot": master_data_snapshot.stats(),
+        },
+    }
+
+
 app.include_router(master_data_controller.router)
 app.include_router(auth_controller.router)
 # app.include_router(user_controller.router)
@@ -84,6 +140,25 @@ app.include_router(auth_controller.router)
 # ----------------------- Startup Event -----------------------
 @app.on_event("startup")
 async def startup_event():
+    # Background writer for action_logs rows
+    action_log_writer.start()
+    event_loop_lag_monitor.start()
+
+    # Compile email templates up front
+    try:
+        email_templates.preload()
+        print("✅ Email templates compiled!")
+    except Exception as e:
+        print("⚠️ Email template compile failed:", e)
+
+    # Drain notifications queued before the restart, and purge used/expired
+    # rows in the background. Started before the DB checks below (which stop
+    # startup early on failure): the workers ride out DB errors and catch up
+    # once the database is reachable
+    notification_dispatcher.start()
+    otp_purge_task.start()
+    refresh_token_sweep_task.start()
+
     engine = get_engine()
     SessionLocal = get_sessionmaker()
 
@@ -111,3 +186,37 @@ async def startup_event():
         print("✅ Seed data successfully applied!")
     except Exception as seed_error:
         print("⚠️ Seed data failed:", seed_error)
+
+    # Warm the app version table used by VersionMiddleware
+    try:
+        await app_version_cache.load()
+        print("✅ App version cache loaded!")
+    except Exception as e:
+        print("⚠️ App version cache load failed:", e)
+
+    # Encode the master-data responses once
+    try:
+        await master_data_snapshot.build()
+        print("✅ Master data snapshot built!")
+    except Exception as e:
+        print("⚠️ Master data snapshot build failed:", e)
+
+
+# ----------------------- Shutdown Event -----------------------
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Finish the notification batches in hand; the rest stay in the outbox
+    await notification_dispatcher.stop()
+
+    # Write out buffered action logs
+    await action_log_writer.stop()
+    await event_loop_lag_monitor.stop()
+    await otp_purge_task.stop()
+    await refresh_token_sweep_task.stop()
+    password_hash_pool.shutdown()
+    smtp_pool.close()
+    await async_smtp_pool.close()
+    await dialog_client.close()
+
+    # Flush queued log records to disk
+    shutdown_logger()
@@ -1,27 +1,91 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
+from starlette.datastructures import URL, Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
 from app.utils.logger import log_info, log_error
+import random
 import time
-import json
 
-class HTTPLoggerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class HTTPLoggerMiddleware:
+    """
+    Pure ASGI middleware that logs method, url, status, timing and request body.
+    The body is captured from the receive channel as the route consumes it and
+    only the first HTTP_LOG_BODY_MAX_BYTES are kept, so memory per request is
+    constant regardless of payload size. Binary content types are never captured.
+    Log lines are sampled per route and per status (status rates take precedence,
+    so errors can always be logged while noisy routes are thinned out).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.body_max_bytes = settings.HTTP_LOG_BODY_MAX_BYTES
+        self.default_sample_rate = settings.HTTP_LOG_SAMPLE_RATE
+        self.route_sample_rates = settings.http_log_route_sample_rates
+        self.status_sample_rates = settings.http_log_status_sample_rates
+        self.skip_body_content_types = tuple(settings.http_log_skip_body_content_types_list)
+
+    def sample_rate(self, path: str, status_code: Optional[int]) -> float:
+        if status_code is not None:
+            status_key = str(status_code)
+            if status_key in self.status_sample_rates:
+                return self.status_sample_rates[status_key]
+            status_class = f"{status_key[0]}xx"
+            if status_class in self.status_sample_rates:
+                return self.status_sample_rates[status_class]
+        return self.route_sample_rates.get(path, self.default_sample_rate)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
-        try:
-            body = await request.body()
-            response = await call_next(request)
-            process_time = time.time() - start_time
+        content_type = Headers(scope=scope).get("content-type", "").lower()
+        capture_body = self.body_max_bytes > 0 and not content_type.startswith(self.skip_body_content_types)
+        body = bytearray()
+        body_size = 0
+        status_code = None
 
-            log_info(json.dumps({
-                "method": request.method,
-                "url": str(request.url),
-                "status_code": response.status_code,
-                "process_time": f"{process_time:.3f}s",
-                "request_body": body.decode("utf-8") if body else None,
-            }))
+        async def receive_wrapper() -> Message:
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                if capture_body and len(body) < self.body_max_bytes:
+                    body.extend(chunk[: self.body_max_bytes - len(body)])
+            return message
 
-            return response
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
         except Exception as e:
             log_error(f"HTTP Error: {str(e)}")
-            raise e
\ No newline at end of file
+            raise
+
+        rate = self.sample_rate(scope["path"], status_code)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return
+
+        process_time = time.time() - start_time
+
+        if not capture_body and body_size:
+            request_body = f"<{body_size} bytes of {content_type or 'unknown content'} not captured>"
+        else:
+            request_body = body.decode("utf-8", errors="replace") if body else None
+
+        log_info(
+            "HTTP request",
+            method=scope["method"],
+            url=str(URL(scope=scope)),
+            status_code=status_code,
+            process_time=f"{process_time:.3f}s",
+            request_body=request_body,
+            request_body_size=body_size,
+            request_body_truncated=capture_body and body_size > len(body),
+        )
@@ -1,66 +1,76 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from sqlalchemy.future import select
-from app.core.database import get_sessionmaker
-from app.seed.models import AppVersion
-from app.utils.response import error_response, force_update, not_found
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils.version_cache import app_version_cache
+from app.utils.response import error_response, force_update
 
-class VersionMiddleware(BaseHTTPMiddleware):
+class VersionMiddleware:
     """
-    Middleware to check app version headers: 'app_type' and 'build_number'.
+    Pure ASGI middleware to check app version headers: 'app_type' and 'build_number'.
     Skips specific paths like '/', '/health_check', '/api/v1/', '/api/v1/health_check'.
     """
 
-    SKIP_PATHS = [
+    SKIP_PATHS = {
         "/",
         "/health_check",
         "/api/v1/",
         "/api/v1/health_check",
         "/api/health/check",
+        "/api/health/metrics",
         "/master_data",
-    ]
+    }
 
-    async def dispatch(self, request: Request, call_next):
-            # Skip version check for certain routes
-            if request.url.path in self.SKIP_PATHS:
-                return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-            app_type = request.headers.get("app_type")
-            build_number = request.headers.get("build_number")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Skip version check for non-HTTP traffic and certain routes
+        if scope["type"] != "http" or scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-            if not app_type or not build_number:
-                return error_response(
-                    message="Missing app_type or build_number headers",
-                    status_code=400
-                )
+        response = await self.check_version(Headers(scope=scope))
+        if response is not None:
+            await response(scope, receive, send)
+            return
 
-            try:
-                build_number = int(build_number)
-            except ValueError:
-                return error_response(
-                    message="Invalid build_number header, must be integer",
-                    status_code=400
-                )
+        # Proceed to next middleware / route
+        await self.app(scope, receive, send)
 
-            # Check DB for current active version
-            Session = get_sessionmaker()
-            async with Session() as session:
-                stmt = select(AppVersion).where(AppVersion.app_type == app_type)
-                result = await session.execute(stmt)
-                app_version = result.scalars().first()
+    async def check_version(self, headers: Headers) -> Optional[Response]:
+        """
+        Return an error response if the client build is rejected, otherwise None.
+        """
+        app_type = headers.get("app_type")
+        build_number = headers.get("build_number")
 
-                if not app_version:
-                    return force_update(
-                        message=f"No version info found for app_type '{app_type}'",
-                        status_code=426
-                    )
+        if not app_type or not build_number:
+            return error_response(
+                message="Missing app_type or build_number headers",
+                status_code=400
+            )
 
-                if build_number < app_version.build_number:
-                    # Force update
-                    return force_update(
-                        message=f"Please update your {app_type} app to the latest version",
-                        status_code=426
-                    )
+        try:
+            build_number = int(build_number)
+        except ValueError:
+            return error_response(
+                message="Invalid build_number header, must be integer",
+                status_code=400
+            )
 
-            # Proceed to next middleware / route
-            return await call_next(request)
+        # Check the in-process app version table (no DB work on the hot path)
+        min_build_number = await app_version_cache.get_min_build_number(app_type)
+
+        if min_build_number is None:
+            return force_update(
+                message=f"No version info found for app_type '{app_type}'"
+            )
+
+        if build_number < min_build_number:
+            # Force update
+            return force_update(
+                message=f"Please update your {app_type} app to the latest version"
+            )
+
+        return None
@@ -126,7 +126,7 @@ async def get_auth_user_data(request: Request, db: AsyncSession = Depends(get_db
     response = await auth_service.get_current_user(token)
     
     if response["success"]:
-        return success_response(message="User data retrieved successfully", data=response["data"].dict())
+        return success_response(message="User data retrieved successfully", data=response["data"].model_dump())
     else:
         return error_response(response["message"], 401)
 
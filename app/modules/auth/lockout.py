@@ -0,0 +1,141 @@
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+from app.utils.timer_wheel import TimerWheel
+
+
+class LoginLockout:
+    """
+    In-memory brute-force guard for the login endpoint.
+    Failed attempts are kept per identifier in a sliding window (a bounded deque
+    of timestamps), so each attempt is O(1) memory work. Only the attempt that
+    trips the lock needs to be persisted; while locked, attempts are rejected
+    without touching the DB.
+    Both tables hold at most `max_tracked` identifiers (least recently used
+    evicted first; an evicted lock is still enforced from users.locked_until)
+    and entries are expired through a timer wheel advanced on every call, so
+    a run of distinct emails cannot grow them without bound.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: int, lockout_seconds: int, max_tracked: int):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.lockout_seconds = lockout_seconds
+        self.max_tracked = max_tracked
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._locked_until: "OrderedDict[str, float]" = OrderedDict()
+        self._expiry = TimerWheel(tick_seconds=1.0)
+
+        # Metrics
+        self.failures_recorded = 0
+        self.locks = 0
+        self.rejected = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _expire(self) -> None:
+        now = time.time()
+        for kind, key in self._expiry.advance():
+            if kind == "lock":
+                until = self._locked_until.get(key)
+                if until is not None and until <= now:
+                    del self._locked_until[key]
+                    self.expired += 1
+            else:
+                attempts = self._failures.get(key)
+                if attempts is not None and (not attempts or attempts[-1] <= now - self.window_seconds):
+                    del self._failures[key]
+                    self.expired += 1
+
+    def locked_for(self, key: str) -> Optional[float]:
+        """
+        Seconds left on the lock for this identifier, or None if not locked
+        """
+        self._expire()
+        until = self._locked_until.get(key)
+        if until is None:
+            return None
+
+        remaining = until - time.time()
+        if remaining <= 0:
+            del self._locked_until[key]
+            self._expiry.cancel(("lock", key))
+            return None
+
+        self.rejected += 1
+        return remaining
+
+    def lock(self, key: str, until: float) -> None:
+        """Mirror a lock that is already persisted (e.g. users.locked_until)"""
+        self._expire()
+        self._locked_until[key] = until
+        self._locked_until.move_to_end(key)
+        self._expiry.schedule(("lock", key), until - time.time())
+        if self._failures.pop(key, None) is not None:
+            self._expiry.cancel(("failures", key))
+
+        while len(self._locked_until) > self.max_tracked:
+            evicted, _ = self._locked_until.popitem(last=False)
+            self._expiry.cancel(("lock", evicted))
+            self.evicted += 1
+
+    def record_failure(self, key: str) -> Optional[float]:
+        """
+        Count a failed attempt. Returns the lock expiry (Unix time) if this
+        attempt tripped the lock, otherwise None.
+        """
+        self._expire()
+        now = time.time()
+        self.failures_recorded += 1
+
+        attempts = self._failures.get(key)
+        if attempts is None:
+            attempts = deque(maxlen=self.max_attempts)
+            self._failures[key] = attempts
+            while len(self._failures) > self.max_tracked:
+                evicted, _ = self._failures.popitem(last=False)
+                self._expiry.cancel(("failures", evicted))
+                self.evicted += 1
+        else:
+            self._failures.move_to_end(key)
+        self._expiry.schedule(("failures", key), self.window_seconds)
+
+        # Slide the window: drop attempts older than window_seconds
+        while attempts and attempts[0] <= now - self.window_seconds:
+            attempts.popleft()
+        attempts.append(now)
+
+        if len(attempts) < self.max_attempts:
+            return None
+
+        until = now + self.lockout_seconds
+        self.lock(key, until)
+        self.locks += 1
+        return until
+
+    def record_success(self, key: str) -> None:
+        self._failures.pop(key, None)
+        self._locked_until.pop(key, None)
+        self._expiry.cancel(("failures", key))
+        self._expiry.cancel(("lock", key))
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._failures),
+            "locked": len(self._locked_until),
+            "failures_recorded": self.failures_recorded,
+            "locks": self.locks,
+            "rejected_while_locked": self.rejected,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+login_lockout = LoginLockout(
+    max_attempts=settings.MAX_LOGIN_ATTEMPTS,
+    window_seconds=settings.LOGIN_ATTEMPT_WINDOW_MINUTES * 60,
+    lockout_seconds=settings.LOCKOUT_DURATION_MINUTES * 60,
+    max_tracked=settings.LOGIN_LOCKOUT_MAX_TRACKED,
+)
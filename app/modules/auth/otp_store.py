@@ -0,0 +1,159 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.modules.auth.schemas import OTPType
+from app.modules.user.repositories import UserRepository
+from app.utils.timer_wheel import TimerWheel
+
+
+@dataclass
+class OTPRecord:
+    email: str
+    otp_type: OTPType
+    otp_code: str
+    otp_reference: str
+    created_at: datetime  # naive UTC, like the otp_verifications columns
+    expires_at: datetime
+    id: Optional[int] = None
+
+
+class OTPStore(ABC):
+    """
+    Storage for one-time passcodes. At most one active OTP per (email, otp_type).
+    """
+
+    @abstractmethod
+    async def create(
+        self,
+        email: str,
+        otp_code: str,
+        otp_type: OTPType,
+        otp_reference: str,
+        expires_minutes: int = 5,
+    ) -> Optional[OTPRecord]:
+        ...
+
+    @abstractmethod
+    async def get_active(self, email: str, otp_type: OTPType) -> Optional[OTPRecord]:
+        ...
+
+    @abstractmethod
+    async def mark_used(self, record: OTPRecord) -> bool:
+        ...
+
+
+class SQLOTPStore(OTPStore):
+    """
+    Durable backend on the otp_verifications table (works across workers).
+    """
+
+    def __init__(self, user_repo: UserRepository):
+        self.user_repo = user_repo
+
+    @staticmethod
+    def _to_record(row, otp_type: OTPType) -> OTPRecord:
+        return OTPRecord(
+            id=row.id,
+            email=row.email,
+            otp_type=otp_type,
+            otp_code=row.otp_code,
+            otp_reference=row.otp_reference,
+            created_at=row.created_at or datetime.utcnow(),
+            expires_at=row.expires_at,
+        )
+
+    async def create(self, email, otp_code, otp_type, otp_reference, expires_minutes=5):
+        row = await self.user_repo.create_otp(
+            email=email,
+            otp_code=otp_code,
+            otp_type=otp_type,
+            otp_reference=otp_reference,
+            expires_minutes=expires_minutes,
+        )
+        return self._to_record(row, otp_type) if row else None
+
+    async def get_active(self, email, otp_type):
+        row = await self.user_repo.get_active_otp(email, otp_type)
+        return self._to_record(row, otp_type) if row else None
+
+    async def mark_used(self, record):
+        return await self.user_repo.mark_otp_used(record.id)
+
+
+class InMemoryOTPStore(OTPStore):
+    """
+    Process-local backend: no DB writes at all. Expiry is driven by a timer wheel
+    advanced on every call, so expired codes are dropped without a sweeper task.
+    Only suitable for a single worker (or sticky routing by email).
+    """
+
+    def __init__(self):
+        self._records: Dict[Tuple[str, str], OTPRecord] = {}
+        self._expiry = TimerWheel(tick_seconds=1.0)
+
+        # Metrics
+        self.created = 0
+        self.used = 0
+        self.expired = 0
+
+    def _expire(self) -> None:
+        for key in self._expiry.advance():
+            if self._records.pop(key, None) is not None:
+                self.expired += 1
+
+    async def create(self, email, otp_code, otp_type, otp_reference, expires_minutes=5):
+        self._expire()
+        now = datetime.utcnow()
+        record = OTPRecord(
+            email=email,
+            otp_type=otp_type,
+            otp_code=otp_code,
+            otp_reference=otp_reference,
+            created_at=now,
+            expires_at=now + timedelta(minutes=expires_minutes),
+        )
+        # Replaces (i.e. invalidates) any earlier code for the same email and type
+        key = (email, otp_type.value)
+        self._records[key] = record
+        self._expiry.schedule(key, expires_minutes * 60)
+        self.created += 1
+        return record
+
+    async def get_active(self, email, otp_type):
+        self._expire()
+        record = self._records.get((email, otp_type.value))
+        if record is None or record.expires_at <= datetime.utcnow():
+            return None
+        return record
+
+    async def mark_used(self, record):
+        key = (record.email, record.otp_type.value)
+        if self._records.get(key) is not record:
+            return False
+        del self._records[key]
+        self._expiry.cancel(key)
+        self.used += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._records),
+            "created": self.created,
+            "used": self.used,
+            "expired": self.expired,
+        }
+
+
+in_memory_otp_store = InMemoryOTPStore()
+
+
+def get_otp_store(user_repo: UserRepository) -> OTPStore:
+    """
+    OTP store for the configured backend (OTP_STORE_BACKEND: "sql" or "memory")
+    """
+    if settings.OTP_STORE_BACKEND == "memory":
+        return in_memory_otp_store
+    return SQLOTPStore(user_repo)
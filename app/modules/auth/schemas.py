@@ -134,6 +134,22 @@ class UserProfile(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AuthPrincipal(BaseModel):
+    """Slim projection of the users row needed to serve authenticated requests"""
+    id: int
+    email: str
+    full_name: str
+    nic: str
+    phone_number: Optional[str]
+    is_active: bool
+    is_email_verified: bool
+    is_profile_completed: bool
+    is_emergency_contact_added: bool
+    subscription_plan_id: Optional[int]
+
+    model_config = {"from_attributes": True, "frozen": True}
+
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,6 +1,7 @@
+import math
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from app.modules.user.models import User
@@ -13,9 +14,12 @@ from app.modules.auth.schemas import (
     RefreshTokenRequest,
 )
 from app.modules.user.repositories import UserRepository
+from app.modules.auth.lockout import login_lockout
+from app.modules.auth.otp_store import get_otp_store
+from app.modules.notification.repositories import NotificationRepository
+from app.modules.notification.dispatcher import notification_dispatcher
 from app.utils.jwt_utils import JWTUtils
 from app.utils.password_utils import PasswordUtils
-from app.utils.email_utils import EmailUtils
 from app.utils.sms_utils import SMSUtils
 from app.utils.action_logger import log_action
 from app.utils.serializers import model_to_dict
@@ -25,6 +29,8 @@ from app.core.config import settings
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.user_repo = UserRepository(db)
+        self.otp_store = get_otp_store(self.user_repo)
+        self.notification_repo = NotificationRepository(db)
 
     # -------------------- Register --------------------
     async def register_user(self, dto: RegisterRequest) -> Dict[str, Any]:
@@ -37,7 +43,7 @@ class AuthService:
             )
 
         # Hash password
-        hashed_password = PasswordUtils.hash_password(dto.password)
+        hashed_password = await PasswordUtils.hash_password_async(dto.password)
         if not hashed_password:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,41 +61,41 @@ class AuthService:
             sign_up_method=1,
         )
 
-        new_user = await self.user_repo.create_user(new_user)
-        if not new_user:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create user",
+        # User, OTP and the outbox row commit together; the email goes out after the response
+        async with self.user_repo.unit_of_work():
+            new_user = await self.user_repo.create_user(new_user)
+            if not new_user:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to create user",
+                )
+
+            # Create OTP
+            otp_code = JWTUtils.generate_otp(6)
+            otp_reference = JWTUtils.generate_otp_reference(6)
+
+            otp_record = await self.otp_store.create(
+                email=new_user.email,
+                otp_code=otp_code,
+                otp_type=OTPType.EMAIL_VERIFICATION,
+                otp_reference=otp_reference,
+                expires_minutes=5,
             )
 
-        # Create OTP
-        otp_code = JWTUtils.generate_otp(6)
-        otp_reference = JWTUtils.generate_otp_reference(6)
-
-        otp_record = await self.user_repo.create_otp(
-            email=new_user.email,
-            otp_code=otp_code,
-            otp_type=OTPType.EMAIL_VERIFICATION,
-            otp_reference=otp_reference,
-            expires_minutes=5,
-        )
+            if not otp_record:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to create verification OTP",
+                )
 
-        if not otp_record:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create verification OTP",
-            )
-
-        # Send email
-        is_sent = await EmailUtils.send_otp_email(new_user.email, otp_code, "email_verification")
-        if not is_sent:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to send verification email",
+            # Queue the verification email
+            self.notification_repo.enqueue(
+                "email", "otp", new_user.email, {"otp_code": otp_code, "otp_type": OTPType.EMAIL_VERIFICATION.value}
             )
+        notification_dispatcher.wake()
 
         # Log action
-        await log_action(new_user.id, "user_registered", {"email": new_user.email})
+        log_action(new_user.id, "user_registered", {"email": new_user.email})
 
 
         return {
@@ -100,40 +106,92 @@ class AuthService:
 
     # -------------------- Login --------------------
     async def login_user(self, dto: LoginRequest, user_agent: str = None, ip_address: str = None) -> Dict[str, Any]:
+        # Reject locked identifiers from memory, before any DB or bcrypt work
+        lockout_key = dto.email.strip().lower()
+        remaining = login_lockout.locked_for(lockout_key)
+        if remaining:
+            raise self._locked_error(remaining)
+
         # Verify user credentials
         user = await self.user_repo.get_by_email(dto.email)
+
+        if user and user.locked_until and user.locked_until > datetime.utcnow():
+            # Locked by another worker (or before a restart)
+            login_lockout.lock(lockout_key, user.locked_until.replace(tzinfo=timezone.utc).timestamp())
+            raise self._locked_error((user.locked_until - datetime.utcnow()).total_seconds())
         
-        if not user or not PasswordUtils.verify_password(dto.password, user.password_hash):
+        if not user or not await PasswordUtils.verify_password_async(dto.password, user.password_hash):
+            if login_lockout.record_failure(lockout_key) and user:
+                # Persist the whole burst with one atomic write when the lock trips
+                await self.user_repo.increment_login_attempts(user.id, settings.MAX_LOGIN_ATTEMPTS)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials or account is deactivated",
             )
 
-        # Reset login attempts and update last login
-        await self.user_repo.reset_login_attempts(user.id)
-        await self.user_repo.update_last_login(user.id)
+        login_lockout.record_success(lockout_key)
+
+        # Upgrade (or downgrade) the stored hash to the configured bcrypt cost
+        new_hash = None
+        if PasswordUtils.needs_rehash(user.password_hash):
+            new_hash = await PasswordUtils.hash_password_async(dto.password)
 
         # Generate tokens
         token_data = {"sub": str(user.id), "email": user.email}
         expires_delta = timedelta(days=30) 
         access_token = JWTUtils.create_access_token(token_data)
         refresh_token = JWTUtils.create_refresh_token(token_data, expires_delta)
-        await self.user_repo.store_refresh_token(user.id, refresh_token, user_agent, ip_address, expires_delta)
+
+        # Also brings the loaded `user` up to date (last_login, attempts reset)
+        await self.record_login(user.id, refresh_token, expires_delta, user_agent, ip_address, new_hash)
 
         tokens = {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer", "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60}
 
         # Log action
-        await log_action(user.id, "user_login", {"ip_address": ip_address, "user_agent": user_agent})
+        log_action(user.id, "user_login", {"ip_address": ip_address, "user_agent": user_agent})
         
-        user.tokens = tokens
-        user = User.from_orm(user)
+        user_data = model_to_dict(user)
+        for field in ("password_hash", "login_attempts", "locked_until"):
+            user_data.pop(field, None)
+        user_data["tokens"] = tokens
         
-        return {"success": True, "message": "Login successful", "data": {"user": user}}
+        return {"success": True, "message": "Login successful", "data": {"user": user_data}}
+
+    @staticmethod
+    def _locked_error(remaining_seconds: float) -> HTTPException:
+        minutes = max(math.ceil(remaining_seconds / 60), 1)
+        return HTTPException(
+            status_code=status.HTTP_423_LOCKED,
+            detail=f"Too many failed login attempts. Try again in {minutes} minute{'s' if minutes != 1 else ''}",
+        )
+
+    async def record_login(
+        self,
+        user_id: int,
+        refresh_token: str,
+        expires_delta: timedelta,
+        user_agent: str = None,
+        ip_address: str = None,
+        new_password_hash: str = None,
+    ) -> None:
+        """
+        All login writes (rehash, attempts reset, last login, refresh token)
+        in a single transaction with one commit; raises (500) if any fails
+        """
+        async with self.user_repo.unit_of_work():
+            # Any failed write raises, so the whole login rolls back and no
+            # unstored refresh token is handed to the client
+            if new_password_hash and not await self.user_repo.update_password_hash(user_id, new_password_hash):
+                raise HTTPException(status_code=500, detail="Failed to update password hash")
+            if not await self.user_repo.record_successful_login(user_id):
+                raise HTTPException(status_code=500, detail="Failed to record login")
+            if not await self.user_repo.store_refresh_token(user_id, refresh_token, user_agent, ip_address, expires_delta):
+                raise HTTPException(status_code=500, detail="Failed to store refresh token")
 
     # -------------------- Request OTP --------------------
     async def request_otp(self, dto: RequestOTPRequest) -> Dict[str, Any]:
         # Check if OTP is already sent recently
-        existing_otp = await self.user_repo.get_active_otp(dto.email, dto.otp_type)
+        existing_otp = await self.otp_store.get_active(dto.email, dto.otp_type)
         if existing_otp and (datetime.utcnow() - existing_otp.created_at).total_seconds() < 60:
             raise HTTPException(status_code=429, detail="OTP already sent recently")
 
@@ -141,31 +199,37 @@ class AuthService:
         otp_code = JWTUtils.generate_otp(6)
         otp_reference = JWTUtils.generate_otp_reference(6)
         
-        # Create and save OTP record
-        otp_record = await self.user_repo.create_otp(
-            email=dto.email,
-            otp_code=otp_code,
-            otp_type=dto.otp_type,
-            otp_reference=otp_reference
-        )
-        if not otp_record:
-            raise HTTPException(status_code=500, detail="Failed to create OTP")
-
-        # Send OTP via email
-        is_sent = await EmailUtils.send_otp_email(dto.email, otp_code, dto.otp_type.value)
-        if not is_sent:
-            raise HTTPException(status_code=500, detail="Failed to send OTP")
+        # OTP record and outbox row commit together
+        async with self.user_repo.unit_of_work():
+            otp_record = await self.otp_store.create(
+                email=dto.email,
+                otp_code=otp_code,
+                otp_type=dto.otp_type,
+                otp_reference=otp_reference
+            )
+            if not otp_record:
+                raise HTTPException(status_code=500, detail="Failed to create OTP")
+
+            # Queue OTP email
+            payload = {"otp_code": otp_code, "otp_type": dto.otp_type.value}
+            if settings.OTP_STORE_BACKEND == "memory":
+                # No DB writes on this backend: send in-process instead of via the outbox
+                notification_dispatcher.submit("email", "otp", dto.email, payload)
+            else:
+                self.notification_repo.enqueue("email", "otp", dto.email, payload)
+        notification_dispatcher.wake()
 
         return {"success": True, "message": f"OTP sent to {dto.email}", "data": {"otp_reference": otp_reference}}
 
     # -------------------- Verify OTP --------------------
     async def verify_otp(self, dto: VerifyOTPRequest) -> Dict[str, Any]:
         # Check if OTP is valid
-        otp_record = await self.user_repo.get_active_otp(dto.email, dto.otp_type)
+        otp_record = await self.otp_store.get_active(dto.email, dto.otp_type)
         if not otp_record or otp_record.otp_code != dto.otp_code or otp_record.expires_at < datetime.utcnow():
             raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
-        await self.user_repo.mark_otp_used(otp_record.id)
+        if not await self.otp_store.mark_used(otp_record):
+            raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
         if dto.otp_type == OTPType.EMAIL_VERIFICATION and dto.email:
             await self.user_repo.mark_email_verified(dto.email)
@@ -174,11 +238,11 @@ class AuthService:
 
     # -------------------- Refresh token --------------------
     async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
-        payload = JWTUtils.verify_token(refresh_token)
-        if payload.get("type") != "refresh":
+        claims = JWTUtils.decode_token(refresh_token)
+        if claims.type != "refresh":
             raise HTTPException(status_code=401, detail="Invalid token type")
 
-        user_id = int(payload.get("sub"))
+        user_id = int(claims.subject)
         stored_token = await self.user_repo.get_refresh_token(refresh_token)
         if not stored_token or not stored_token.is_active:
             raise HTTPException(status_code=401, detail="Invalid refresh token")
@@ -189,7 +253,7 @@ class AuthService:
 
         await self.user_repo.update_refresh_token_usage(stored_token.id)
         new_access_token = JWTUtils.create_access_token({"sub": str(user.id), "email": user.email})
-        await log_action(user.id, "token_refreshed", {})
+        log_action(user.id, "token_refreshed", {})
 
         tokens = {"access_token": new_access_token, "refresh_token": refresh_token, "token_type": "bearer", "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60}
         
@@ -197,27 +261,25 @@ class AuthService:
 
     # -------------------- Get current user --------------------
     async def get_current_user(self, token: str) -> Dict[str, Any]:
-        payload = JWTUtils.verify_token(token)
-        
-        if payload.get("type") != "access":
+        claims = JWTUtils.decode_token(token)
+
+        if claims.type != "access":
             raise HTTPException(status_code=401, detail="Invalid token type")
 
-        user_id = int(payload.get("sub"))
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
+        user_id = int(claims.subject)
+        principal = await self.user_repo.get_principal(user_id)
+        if not principal:
             raise HTTPException(status_code=401, detail="User not found or inactive")
-        
-        user = User.from_orm(user)
 
-        return {"success": True, "message": "User retrieved successfully", "data": user}
+        return {"success": True, "message": "User retrieved successfully", "data": principal}
 
     # -------------------- Logout --------------------
     async def logout_user(self, dto: RefreshTokenRequest) -> Dict[str, Any]:
         await self.user_repo.deactivate_refresh_token(dto.refresh_token)
-        await log_action(dto.user_id, "user_logout", {})
+        log_action(dto.user_id, "user_logout", {})
         return {"success": True, "message": "Logged out successfully", "data": None}
 
     async def logout_all_devices(self, user_id: int) -> Dict[str, Any]:
         await self.user_repo.deactivate_all_refresh_tokens(user_id)
-        await log_action(user_id, "logout_all_devices", {})
+        log_action(user_id, "logout_all_devices", {})
         return {"success": True, "message": "Logged out from all devices", "data": None}
\ No newline at end of file
@@ -1,23 +1,41 @@
-from fastapi import APIRouter, Depends, Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
 
 from app.core.database import get_db
 from app.modules.master_data.services import MasterDataService
-from app.utils.response import success_response, not_found, internal_error
+from app.modules.master_data.snapshot import SnapshotEntry, master_data_snapshot
+from app.utils.response import not_found, internal_error
 from app.modules.master_data.services import MODEL_SCHEMA_MAP  # for validation
 
 router = APIRouter(prefix="/master-data", tags=["Master Data"])
 
 
+def snapshot_response(request: Request, entry: SnapshotEntry) -> Response:
+    """
+    200 with the pre-encoded body, or 304 when If-None-Match has its ETag
+    """
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={entry.max_age}"}
+    if entry.version is not None:
+        headers["X-Data-Version"] = str(entry.version)
+    if entry.matches(request.headers.get("if-none-match")):
+        master_data_snapshot.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
 @router.get("/all", summary="Get all master data")
-async def get_all_master_data(db: AsyncSession = Depends(get_db)):
+async def get_all_master_data(request: Request):
     """
     Retrieve all master data at once.
+    Served from the in-process snapshot as pre-encoded JSON; supports If-None-Match.
     """
-    service = MasterDataService(db)
-    response = await service.get_all_master_data()
-    return response  # service already returns a HTTP-ready response
+    try:
+        entry = await master_data_snapshot.get_all()
+    except Exception as e:
+        return internal_error(message=f"Failed fetching all master data: {str(e)}")
+    return snapshot_response(request, entry)
 
 
 @router.get(
@@ -25,22 +43,35 @@ async def get_all_master_data(db: AsyncSession = Depends(get_db)):
     summary="Get single master data type",
 )
 async def get_single_master_data(
+    request: Request,
     data_type: str = Path(
         ...,
         description="Type of master data to retrieve",
         example="genders",
         regex="^[a-zA-Z_]+$",
     ),
+    since: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Return only rows changed after this X-Data-Version (suggestion lists only)",
+    ),
     db: AsyncSession = Depends(get_db),
-) -> Dict[str, Any]:
+):
     """
     Retrieve a single type of master data, e.g., genders, blood_types.
     Input is validated against allowed master data types.
+    With `since`, returns the changes after that version instead (delta sync).
     """
     allowed_types = MODEL_SCHEMA_MAP.keys()
     if data_type.lower() not in allowed_types:
         return not_found(message=f"Master data type '{data_type}' not found.")
 
-    service = MasterDataService(db)
-    response = await service.get_master_data_by_type(data_type)
-    return response  # service already returns a HTTP-ready response
\ No newline at end of file
+    if since is not None:
+        service = MasterDataService(db)
+        return await service.get_master_data_changes(data_type, since)
+
+    try:
+        entry = await master_data_snapshot.get(data_type.lower())
+    except Exception as e:
+        return internal_error(message=f"Failed fetching master data for '{data_type}': {str(e)}")
+    return snapshot_response(request, entry)
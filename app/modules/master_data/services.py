@@ -1,5 +1,6 @@
 # app/modules/master_data/services.py
 from typing import List, Dict, Tuple, Type
+from sqlalchemy import func
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +16,7 @@ from app.seed.models import (
     GeneticCondition,
     AppVersion,
     SubscriptionPlan,
+    MasterDataChange,
 )
 from app.modules.master_data.schemas import (
     GenderSchema,
@@ -30,44 +32,56 @@ from app.modules.master_data.schemas import (
     SubscriptionPlanSchema,
 )
 from app.utils.logger import log_error, log_info
-from app.utils.response import success_response, not_found, internal_error
+from app.utils.response import success_response, bad_request, not_found, internal_error
 
 
-# Mapping: "request path name" -> (ORM model, Pydantic schema)
-MODEL_SCHEMA_MAP: Dict[str, Tuple[Type, Type]] = {
-    "genders": (Gender, GenderSchema),
-    "blood_types": (BloodType, BloodTypeSchema),
-    "unit_types": (UnitType, UnitTypeSchema),
-    "smoking_levels": (SmokingLevel, SmokingLevelSchema),
-    "alcohol_levels": (AlcoholLevel, AlcoholLevelSchema),
-    "exercise_levels": (ExerciseLevel, ExerciseLevelSchema),
+# Mapping: "request path name" -> (ORM model, Pydantic schema, Cache-Control max-age seconds)
+MODEL_SCHEMA_MAP: Dict[str, Tuple[Type, Type, int]] = {
+    "genders": (Gender, GenderSchema, 86400),
+    "blood_types": (BloodType, BloodTypeSchema, 86400),
+    "unit_types": (UnitType, UnitTypeSchema, 86400),
+    "smoking_levels": (SmokingLevel, SmokingLevelSchema, 86400),
+    "alcohol_levels": (AlcoholLevel, AlcoholLevelSchema, 86400),
+    "exercise_levels": (ExerciseLevel, ExerciseLevelSchema, 86400),
     "medical_conditions_suggestions": (
         MedicalConditionSuggestion,
         MedicalConditionSuggestionSchema,
+        3600,
     ),
-    "allergies": (Allergy, AllergySchema),
-    "genetic_conditions": (GeneticCondition, GeneticConditionSchema),
-    "app_versions": (AppVersion, AppVersionSchema),
-    "subscription_plans": (SubscriptionPlan, SubscriptionPlanSchema),
+    "allergies": (Allergy, AllergySchema, 3600),
+    "genetic_conditions": (GeneticCondition, GeneticConditionSchema, 3600),
+    "app_versions": (AppVersion, AppVersionSchema, 300),  # force-update rules must propagate quickly
+    "subscription_plans": (SubscriptionPlan, SubscriptionPlanSchema, 3600),
 }
 
+# Types whose changes are logged to master_data_changes (see the triggers in db.sql)
+# and can be fetched with ?since=<version>
+DELTA_SYNC_TYPES = ("medical_conditions_suggestions", "allergies", "genetic_conditions")
+
 
 class MasterDataService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def fetch_master_data(self, key: str) -> List[dict]:
+        """
+        Rows of one master table as plain dicts (validated through its schema)
+        """
+        model_cls, schema_cls, _ = MODEL_SCHEMA_MAP[key]
+        rows = (await self.db.execute(select(model_cls))).scalars().all()
+        return [schema_cls.model_validate(r).model_dump() for r in rows]
+
+    async def fetch_all_master_data(self) -> Dict[str, List[dict]]:
+        return {key: await self.fetch_master_data(key) for key in MODEL_SCHEMA_MAP}
+
     async def get_all_master_data(self) -> Dict[str, any]:
         """
         Fetch all master tables and return a uniform HTTP response.
         """
-        output: Dict[str, List[dict]] = {}
-
         try:
             log_info("Fetching all master data")
 
-            for key, (model_cls, schema_cls) in MODEL_SCHEMA_MAP.items():
-                rows = (await self.db.execute(select(model_cls))).scalars().all()
-                output[key] = [schema_cls.model_validate(r).model_dump() for r in rows]
+            output = await self.fetch_all_master_data()
 
             log_info("Fetched all master data successfully")
             return success_response(
@@ -96,9 +110,7 @@ class MasterDataService:
                     message=f"Master data type '{data_type}' not found."
                 )
 
-            model_cls, schema_cls = MODEL_SCHEMA_MAP[key]
-            rows = (await self.db.execute(select(model_cls))).scalars().all()
-            output = [schema_cls.model_validate(r).model_dump() for r in rows]
+            output = await self.fetch_master_data(key)
 
             log_info(f"Fetched {len(output)} rows for {key}")
             return success_response(
@@ -110,4 +122,84 @@ class MasterDataService:
             log_error(f"Error fetching master data for {data_type}: {e}")
             return internal_error(
                 message=f"Failed fetching master data for '{data_type}': {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def fetch_data_version(self, key: str) -> int:
+        """
+        Latest change version of a delta-sync table (0 before any logged change).
+        Versions are handed out in commit order (see master_data_version in
+        db.sql), so no change at or below this can still appear later.
+        """
+        table_name = MODEL_SCHEMA_MAP[key][0].__tablename__
+        version = (
+            await self.db.execute(
+                select(func.max(MasterDataChange.version)).where(MasterDataChange.table_name == table_name)
+            )
+        ).scalar()
+        return version or 0
+
+    async def fetch_data_versions(self) -> Dict[str, int]:
+        return {key: await self.fetch_data_version(key) for key in DELTA_SYNC_TYPES}
+
+    async def get_master_data_changes(self, data_type: str, since: int) -> Dict[str, any]:
+        """
+        Rows of a delta-sync table inserted, updated or deleted after `since`.
+        Cost follows the number of changes, not the table size. A cursor of 0
+        or one ahead of the log (e.g. after a DB restore) gets every row back
+        with full_resync set, and the client replaces its copy.
+        """
+        key = data_type.lower()
+
+        if key not in DELTA_SYNC_TYPES:
+            return bad_request(message=f"Delta sync is not supported for '{data_type}'.")
+
+        try:
+            model_cls, schema_cls, _ = MODEL_SCHEMA_MAP[key]
+            table_name = model_cls.__tablename__
+            version = await self.fetch_data_version(key)
+
+            if since <= 0 or since > version:
+                upserted = await self.fetch_master_data(key)
+                deleted: List[int] = []
+                full_resync = True
+            else:
+                # Bounded by `version` so the next call resumes exactly where this one ends
+                changed_ids = (
+                    await self.db.execute(
+                        select(MasterDataChange.row_id)
+                        .where(
+                            MasterDataChange.table_name == table_name,
+                            MasterDataChange.version > since,
+                            MasterDataChange.version <= version,
+                        )
+                        .distinct()
+                    )
+                ).scalars().all()
+
+                rows = []
+                if changed_ids:
+                    rows = (await self.db.execute(select(model_cls).where(model_cls.id.in_(changed_ids)))).scalars().all()
+                upserted = [schema_cls.model_validate(r).model_dump() for r in rows]
+                # Changed rows that no longer exist were deleted
+                deleted = sorted(set(changed_ids) - {row["id"] for row in upserted})
+                full_resync = False
+
+            log_info(f"Master data delta for {key} since {since}: {len(upserted)} upserted, {len(deleted)} deleted")
+            response = success_response(
+                message=f"Master data changes for '{data_type}' retrieved successfully.",
+                data={
+                    "version": version,
+                    "since": since,
+                    "full_resync": full_resync,
+                    "upserted": upserted,
+                    "deleted": deleted,
+                },
+            )
+            response.headers["X-Data-Version"] = str(version)
+            return response
+
+        except Exception as e:
+            log_error(f"Error fetching master data changes for {data_type}: {e}")
+            return internal_error(
+                message=f"Failed fetching master data changes for '{data_type}': {str(e)}"
+            )
@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.modules.master_data.services import MODEL_SCHEMA_MAP, MasterDataService
+from app.utils.logger import log_info, log_error
+
+
+def encode_envelope(data: Any, message: str) -> bytes:
+    """
+    The success_response body, encoded once
+    """
+    return orjson.dumps({"success": True, "message": message, "data": data or [], "statusCode": 200})
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    body: bytes
+    etag: str  # strong validator: quoted content hash of body
+    max_age: int
+    version: Optional[int] = None  # change version for DELTA_SYNC_TYPES
+
+    @classmethod
+    def create(cls, body: bytes, max_age: int, version: Optional[int] = None) -> "SnapshotEntry":
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', max_age=max_age, version=version)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        If-None-Match check (weak comparison, as RFC 9110 requires for this header)
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == self.etag for tag in if_none_match.split(","))
+
+
+class MasterDataSnapshot:
+    """
+    In-process copy of every master table, held as the finished JSON response
+    bodies for /master-data/all and each /master-data/{data_type}, with their
+    ETags and max-age (from MODEL_SCHEMA_MAP; /all uses the smallest). Built at
+    startup, rebuilt in the background once the TTL elapses (so writes made
+    elsewhere, or by another worker, show up) and right after invalidate();
+    rebuilds are single-flight and the previous bodies keep being served
+    until the new ones are swapped in.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._all: Optional[SnapshotEntry] = None
+        self._by_type: Dict[str, SnapshotEntry] = {}
+        self._built_at: Optional[float] = None  # when the rows were read (time.monotonic())
+        self._invalidated_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.hits = 0
+        self.not_modified = 0
+        self.builds = 0
+        self.build_failures = 0
+        self.last_build_ms: Optional[float] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        if self._invalidated_at is not None and self._invalidated_at >= self._built_at:
+            return True
+        return (time.monotonic() - self._built_at) >= self.ttl_seconds
+
+    async def build(self) -> None:
+        """
+        Read every master table and re-encode all response bodies.
+        Concurrent callers share one build.
+        """
+        requested_at = time.monotonic()
+        async with self._lock:
+            if self._built_at is not None and self._built_at >= requested_at and not self.is_stale():
+                # Another caller rebuilt while we were waiting for the lock
+                return
+
+            built_at = time.monotonic()
+            start = time.perf_counter()
+            try:
+                # Versions first: rows read afterwards are at least that new
+                versions = await self._fetch_data_versions()
+                Session = get_sessionmaker()
+                async with Session() as session:
+                    data = await MasterDataService(session).fetch_all_master_data()
+
+                by_type = {
+                    key: SnapshotEntry.create(
+                        encode_envelope(rows, f"Master data for '{key}' retrieved successfully."),
+                        MODEL_SCHEMA_MAP[key][2],
+                        versions.get(key),
+                    )
+                    for key, rows in data.items()
+                }
+                self._all = SnapshotEntry.create(
+                    encode_envelope(data, "All master data retrieved successfully."),
+                    min(entry.max_age for entry in by_type.values()),
+                )
+                self._by_type = by_type
+                self._built_at = built_at
+                self.builds += 1
+                self.last_build_ms = (time.perf_counter() - start) * 1000
+                log_info(f"Master data snapshot built in {self.last_build_ms:.2f}ms ({len(self._all.body)} bytes)")
+            except Exception as e:
+                self.build_failures += 1
+                log_error(f"Failed to build master data snapshot: {e}")
+                raise
+
+    async def _fetch_data_versions(self) -> Dict[str, int]:
+        """
+        Delta-sync versions, or {} when the change log cannot be read (e.g. the
+        table is missing); the snapshot is then served without X-Data-Version
+        """
+        try:
+            Session = get_sessionmaker()
+            async with Session() as session:
+                return await MasterDataService(session).fetch_data_versions()
+        except Exception as e:
+            log_error(f"Failed to read master data versions: {e}")
+            return {}
+
+    def _schedule_rebuild(self) -> None:
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        self._rebuild_task = asyncio.create_task(self._rebuild_quietly())
+
+    async def _rebuild_quietly(self) -> None:
+        try:
+            await self.build()
+        except Exception:
+            # Already logged; keep serving the previous snapshot until the next attempt
+            pass
+
+    async def _ensure_built(self) -> None:
+        if not self.is_built:
+            await self.build()
+        elif self.is_stale():
+            self._schedule_rebuild()
+        self.hits += 1
+
+    async def get_all(self) -> SnapshotEntry:
+        """
+        Response for /master-data/all
+        """
+        await self._ensure_built()
+        return self._all
+
+    async def get(self, data_type: str) -> Optional[SnapshotEntry]:
+        """
+        Response for /master-data/{data_type}, or None if the type is unknown
+        """
+        await self._ensure_built()
+        return self._by_type.get(data_type)
+
+    def invalidate(self) -> None:
+        """
+        Mark the snapshot stale after a master table changes and rebuild it in the background.
+        """
+        self._invalidated_at = time.monotonic()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop (e.g. a script); the next request rebuilds
+            return
+        self._schedule_rebuild()
+
+    def stats(self) -> dict:
+        return {
+            "built": self.is_built,
+            "stale": self.is_built and self.is_stale(),
+            "types": len(self._by_type),
+            "all_bytes": len(self._all.body) if self._all is not None else 0,
+            "all_etag": self._all.etag if self._all is not None else None,
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "builds": self.builds,
+            "build_failures": self.build_failures,
+            "last_build_ms": round(self.last_build_ms, 3) if self.last_build_ms is not None else None,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+master_data_snapshot = MasterDataSnapshot(ttl_seconds=settings.MASTER_DATA_SNAPSHOT_TTL_SECONDS)
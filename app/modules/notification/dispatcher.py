@@ -0,0 +1,206 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.modules.notification.repositories import NotificationRepository, OutboxMessage
+from app.utils.email_utils import EmailUtils
+from app.utils.sms_utils import SMSUtils
+from app.utils.smtp_pool import SMTPDeliveryUnknown
+from app.utils.logger import log_error
+
+# (channel, template) -> sender(recipient, **payload) -> bool
+SENDERS = {
+    ("email", "otp"): EmailUtils.send_otp_email,
+    ("email", "welcome"): EmailUtils.send_welcome_email,
+    ("email", "password_reset"): EmailUtils.send_password_reset_email,
+    ("sms", "otp"): SMSUtils.send_otp_sms,
+    ("sms", "welcome"): SMSUtils.send_welcome_sms,
+}
+
+
+class FinalError(str):
+    """
+    Delivery error that must not be retried (e.g. the server may already have the message)
+    """
+
+
+class OutboxDispatcher:
+    """
+    In-process worker pool draining the notification_outbox table.
+    Each worker claims a batch, sends it concurrently, deletes what went out
+    and reschedules failures with exponential backoff (with jitter) until
+    `max_attempts`, after which the row is dead-lettered (at once if delivery
+    is unknown, i.e. the server may already have it). Workers sleep on an
+    Event between polls, so wake() right after a commit gets mail out at once.
+    submit() is the in-process path for callers that must not write to the DB
+    (OTP_STORE_BACKEND=memory): same senders and backoff, no outbox row, so
+    like those OTPs it does not survive a restart.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        lease_seconds: int,
+        max_attempts: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        poll_interval_seconds: float,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+        self.poll_interval = poll_interval_seconds
+        self._wake = asyncio.Event()
+        # Claims are serialized within the process; SKIP LOCKED keeps processes apart
+        self._claim_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._in_process: Set[asyncio.Task] = set()
+        self._stopping = False
+
+        # Metrics
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.last_batch_size = 0
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        self._stopping = False
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Let workers finish the batch in hand; anything unsent stays in the outbox.
+        """
+        self._stopping = True
+        self._wake.set()
+        tasks = self._tasks + list(self._in_process)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._tasks = []
+
+    def submit(self, channel: str, template: str, recipient: str, payload: Dict[str, Any]) -> None:
+        """
+        Deliver one notification in-process, retrying with backoff up to `max_attempts`
+        """
+        message = OutboxMessage(0, channel, template, recipient, payload, 0)
+        task = asyncio.create_task(self._deliver_in_process(message))
+        self._in_process.add(task)
+        task.add_done_callback(self._in_process.discard)
+
+    async def _deliver_in_process(self, message: OutboxMessage) -> None:
+        while True:
+            message.attempts += 1
+            error = await self._deliver(message)
+            if error is None:
+                self.sent += 1
+                return
+            if message.attempts >= self.max_attempts or isinstance(error, FinalError) or self._stopping:
+                self.dead += 1
+                log_error(
+                    "Notification dead-lettered",
+                    channel=message.channel,
+                    template=message.template,
+                    attempts=message.attempts,
+                    error=error,
+                )
+                return
+            self.retried += 1
+            await asyncio.sleep(self.backoff(message.attempts))
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        return random.uniform(delay / 2, delay)
+
+    async def _deliver(self, message: OutboxMessage) -> Optional[str]:
+        sender = SENDERS.get((message.channel, message.template))
+        if sender is None:
+            return f"No sender for {message.channel}/{message.template}"
+        try:
+            if await sender(message.recipient, **message.payload):
+                return None
+            return "Provider rejected or failed to send"
+        except SMTPDeliveryUnknown as e:
+            # Possibly delivered: dead-letter rather than risk sending it twice
+            return FinalError(str(e))
+        except Exception as e:
+            return str(e) or e.__class__.__name__
+
+    async def _worker(self) -> None:
+        Session = get_sessionmaker()
+        while not self._stopping:
+            async with Session() as session:
+                repo = NotificationRepository(session)
+                async with self._claim_lock:
+                    messages = await repo.claim_batch(self.batch_size, self.lease_seconds)
+                if not messages:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wake.clear()
+                    continue
+
+                errors = await asyncio.gather(*(self._deliver(message) for message in messages))
+                self.batches += 1
+                self.last_batch_size = len(messages)
+
+                sent_ids = [message.id for message, error in zip(messages, errors) if error is None]
+                if sent_ids:
+                    await repo.delete_sent(sent_ids)
+                    self.sent += len(sent_ids)
+
+                for message, error in zip(messages, errors):
+                    if error is None:
+                        continue
+                    if message.attempts >= self.max_attempts or isinstance(error, FinalError):
+                        retry_at = None
+                        self.dead += 1
+                        log_error(
+                            "Notification dead-lettered",
+                            notification_id=message.id,
+                            channel=message.channel,
+                            template=message.template,
+                            attempts=message.attempts,
+                            error=error,
+                        )
+                    else:
+                        retry_at = datetime.utcnow() + timedelta(seconds=self.backoff(message.attempts))
+                        self.retried += 1
+                    await repo.record_failure(message.id, error, retry_at)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "in_process": len(self._in_process),
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+
+notification_dispatcher = OutboxDispatcher(
+    workers=settings.NOTIFICATION_WORKERS,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    lease_seconds=settings.NOTIFICATION_LEASE_SECONDS,
+    max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+    backoff_base_seconds=settings.NOTIFICATION_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.NOTIFICATION_BACKOFF_MAX_SECONDS,
+    poll_interval_seconds=settings.NOTIFICATION_POLL_INTERVAL_SECONDS,
+)
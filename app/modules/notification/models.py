@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import func
+
+Base = declarative_base()
+
+STATUS_PENDING = 1
+STATUS_DEAD = 2
+
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    channel = Column(String(20), nullable=False)  # 'email', 'sms'
+    template = Column(String(50), nullable=False)  # 'otp', 'welcome', 'password_reset'
+    recipient = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Integer, default=STATUS_PENDING, nullable=False)  # 1: pending, 2: dead (sent rows are deleted)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=func.now(), nullable=False)  # also the claim lease
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
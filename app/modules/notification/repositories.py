@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete
+
+from app.modules.notification.models import NotificationOutbox, STATUS_PENDING, STATUS_DEAD
+from app.utils.logger import log_error
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    channel: str
+    template: str
+    recipient: str
+    payload: Dict[str, Any]
+    attempts: int  # including the current one
+
+
+class NotificationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def enqueue(self, channel: str, template: str, recipient: str, payload: Dict[str, Any]) -> NotificationOutbox:
+        """
+        Stage an outbox row in the caller's transaction (e.g. UserRepository.unit_of_work);
+        it becomes visible to the dispatcher only when that transaction commits.
+        """
+        message = NotificationOutbox(
+            channel=channel,
+            template=template,
+            recipient=recipient,
+            payload=payload,
+            status=STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+        )
+        self.db.add(message)
+        return message
+
+    async def claim_batch(self, batch_size: int, lease_seconds: int) -> List[OutboxMessage]:
+        """
+        Claim up to `batch_size` due messages. Rows locked by another worker are
+        skipped (FOR UPDATE SKIP LOCKED), and claimed rows get next_attempt_at
+        pushed out by the lease, so a crashed worker's batch is retried later.
+        """
+        try:
+            now = datetime.utcnow()
+            query = (
+                select(NotificationOutbox)
+                .where(
+                    NotificationOutbox.status == STATUS_PENDING,
+                    NotificationOutbox.next_attempt_at <= now,
+                )
+                .order_by(NotificationOutbox.next_attempt_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await self.db.execute(query)).scalars().all()
+            if not rows:
+                await self.db.commit()
+                return []
+
+            await self.db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_([row.id for row in rows]))
+                .values(
+                    attempts=NotificationOutbox.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=lease_seconds),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            messages = [
+                OutboxMessage(row.id, row.channel, row.template, row.recipient, row.payload, row.attempts + 1)
+                for row in rows
+            ]
+            await self.db.commit()
+            return messages
+        except:
+            await self.db.rollback()
+            log_error("Error claiming notification outbox batch")
+            return []
+
+    async def delete_sent(self, ids: List[int]) -> bool:
+        try:
+            await self.db.execute(delete(NotificationOutbox).where(NotificationOutbox.id.in_(ids)))
+            await self.db.commit()
+            return True
+        except:
+            await self.db.rollback()
+            log_error(f"Error deleting {len(ids)} sent notifications")
+            return False
+
+    async def record_failure(self, message_id: int, error: str, retry_at: Optional[datetime]) -> bool:
+        """
+        Schedule a retry at `retry_at`, or dead-letter the message when it is None.
+        Dead letters are kept for inspection with their payload scrubbed, so no
+        OTP code or reset token outlives the attempt to send it.
+        """
+        try:
+            values = {"last_error": error[:2000]}
+            if retry_at is None:
+                values["status"] = STATUS_DEAD
+                values["payload"] = {}
+            else:
+                values["next_attempt_at"] = retry_at
+            await self.db.execute(
+                update(NotificationOutbox).where(NotificationOutbox.id == message_id).values(**values)
+            )
+            await self.db.commit()
+            return True
+        except:
+            await self.db.rollback()
+            log_error(f"Error recording failure for notification {message_id}")
+            return False
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.modules.user.repositories import UserRepository
+from app.utils.periodic import PeriodicTask
+
+
+async def table_size(session, table: str) -> Optional[dict]:
+    """
+    Approximate row count and on-disk size from information_schema (MySQL only)
+    """
+    try:
+        result = await session.execute(
+            text(
+                "SELECT TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+            ),
+            {"table": table},
+        )
+        row = result.first()
+    except Exception:
+        await session.rollback()
+        return None
+    if row is None:
+        return None
+    return {"rows": int(row[0] or 0), "size_mb": round(float(row[1] or 0) / (1024 * 1024), 2)}
+
+
+async def purge_otp_verifications() -> dict:
+    """
+    One pass over otp_verifications, deleting used and expired rows batch by batch
+    """
+    start = time.perf_counter()
+    deleted = batches = 0
+
+    Session = get_sessionmaker()
+    async with Session() as session:
+        repo = UserRepository(session)
+        last_id = 0
+        while True:
+            scanned_to, count = await repo.purge_otps(last_id, settings.OTP_PURGE_BATCH_SIZE)
+            if scanned_to == last_id:
+                break
+            last_id = scanned_to
+            deleted += count
+            batches += 1
+            # Yield between batches so request handlers get the loop (and the DB) in between
+            await asyncio.sleep(settings.OTP_PURGE_BATCH_PAUSE_MS / 1000)
+
+        size = await table_size(session, "otp_verifications")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "rows_per_second": round(deleted / elapsed, 1) if elapsed > 0 else 0.0,
+        "table_rows": size["rows"] if size else None,
+        "table_size_mb": size["size_mb"] if size else None,
+    }
+
+
+async def sweep_refresh_tokens() -> dict:
+    """
+    Delete revoked and expired refresh tokens in bounded batches, paced to at
+    most REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_SECOND and REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_RUN
+    """
+    batch_size = settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+    max_rows = settings.REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_RUN
+    rate = settings.REFRESH_TOKEN_SWEEP_MAX_ROWS_PER_SECOND
+    start = time.perf_counter()
+    deleted = batches = 0
+
+    Session = get_sessionmaker()
+    async with Session() as session:
+        repo = UserRepository(session)
+        while deleted < max_rows:
+            count = await repo.purge_refresh_tokens(min(batch_size, max_rows - deleted))
+            deleted += count
+            batches += 1
+            if count < batch_size:
+                break
+            # Rate limit: sleep until the deleted total is back under the allowed rows/sec (<= 0: unlimited)
+            pause = deleted / rate - (time.perf_counter() - start) if rate > 0 else 0
+            await asyncio.sleep(max(pause, 0))
+
+        size = await table_size(session, "refresh_tokens")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "reclaimed": deleted,
+        "batches": batches,
+        "rows_per_second": round(deleted / elapsed, 1) if elapsed > 0 else 0.0,
+        "table_rows": size["rows"] if size else None,
+        "table_size_mb": size["size_mb"] if size else None,
+    }
+
+
+otp_purge_task = PeriodicTask(
+    name="otp_purge",
+    job=purge_otp_verifications,
+    interval_seconds=settings.OTP_PURGE_INTERVAL_SECONDS,
+    enabled=settings.OTP_PURGE_ENABLED,
+    total_fields=("deleted",),
+)
+
+refresh_token_sweep_task = PeriodicTask(
+    name="refresh_token_sweep",
+    job=sweep_refresh_tokens,
+    interval_seconds=settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+    enabled=settings.REFRESH_TOKEN_SWEEP_ENABLED,
+    total_fields=("reclaimed",),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, BINARY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy import Index
@@ -108,7 +108,10 @@ class OTPVerification(Base):
     used_at = Column(DateTime, nullable=True)
     
     __table_args__ = (
-        Index('ix_otp_verifications_email', 'email'),
+        # Serves get_active_otp: equality on the first three columns, newest
+        # created_at first, expires_at checked in the index. Covering for the
+        # id lookup; only the one matching row is read from the table
+        Index('ix_otp_verifications_lookup', 'email', 'otp_type', 'is_used', 'created_at', 'expires_at'),
     )
 
 
@@ -117,7 +120,8 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, nullable=False)
-    token = Column(String(500), nullable=False, unique=True)
+    token_hash = Column(BINARY(32), nullable=False, unique=True)  # SHA-256 of the JWT
+    token = Column(String(500), nullable=True)  # Legacy plaintext column, no longer written
     is_active = Column(Boolean, default=True, nullable=False)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)
@@ -127,6 +131,7 @@ class RefreshToken(Base):
     
     __table_args__ = (
         Index('ix_refresh_tokens_user_id_is_active', 'user_id', 'is_active'),
+        Index('ix_refresh_tokens_is_active_expires_at', 'is_active', 'expires_at'),  # sweeper
     )
 
 
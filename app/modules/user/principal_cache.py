@@ -0,0 +1,82 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.modules.auth.schemas import AuthPrincipal
+
+
+class PrincipalCache:
+    """
+    TTL cache of authenticated principals (slim user projections) keyed by user id.
+    UserRepository invalidates entries whenever it writes to the user row, so the
+    TTL only bounds staleness across workers.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[int, Tuple[float, AuthPrincipal]] = {}
+        self._ids_by_email: Dict[str, int] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[AuthPrincipal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(user_id)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return principal
+
+    def put(self, principal: AuthPrincipal) -> None:
+        if self.max_size <= 0:
+            return
+        self._remove(principal.id)
+        while len(self._entries) >= self.max_size:
+            # Dicts keep insertion order: drop the oldest entry
+            self._remove(next(iter(self._entries)))
+        self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+        self._ids_by_email[principal.email] = principal.id
+
+    def invalidate(self, user_id: int) -> None:
+        if self._remove(user_id):
+            self.invalidations += 1
+
+    def invalidate_email(self, email: str) -> None:
+        user_id = self._ids_by_email.get(email)
+        if user_id is not None:
+            self.invalidate(user_id)
+
+    def _remove(self, user_id: int) -> bool:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        self._ids_by_email.pop(entry[1].email, None)
+        return True
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
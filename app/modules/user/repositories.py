@@ -1,18 +1,59 @@
 # app/modules/user/repositories.py
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_, or_
+from sqlalchemy import select, update, delete, and_, or_, case
 
 from app.modules.user.models import User, OTPVerification, RefreshToken
-from app.modules.auth.schemas import OTPType
+from app.modules.auth.schemas import OTPType, AuthPrincipal
+from app.modules.user.principal_cache import principal_cache
 from app.core.config import settings
+from app.utils.jwt_utils import JWTUtils
 from app.utils.logger import log_info, log_error
 
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self._in_unit_of_work = False
+        self._after_commit: list[Callable[[], None]] = []
+
+    # -------------------- Unit of work --------------------
+    @asynccontextmanager
+    async def unit_of_work(self):
+        """
+        Stage writes from every repository call in the block and commit them
+        in one transaction on exit (rolled back if the block raises).
+        """
+        self._in_unit_of_work = True
+        try:
+            yield self
+            await self.db.commit()
+        except:
+            await self.db.rollback()
+            self._after_commit.clear()
+            raise
+        finally:
+            self._in_unit_of_work = False
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def _commit(self, after_commit: Optional[Callable[[], None]] = None):
+        """
+        Commit now, or leave it to the enclosing unit of work.
+        `after_commit` (e.g. cache invalidation) runs once the data is durable.
+        """
+        if self._in_unit_of_work:
+            if after_commit:
+                self._after_commit.append(after_commit)
+            return
+
+        await self.db.commit()
+        if after_commit:
+            after_commit()
 
     # -------------------- User --------------------
     async def get_by_email(self, email: str) -> Optional[User]:
@@ -33,7 +74,31 @@ class UserRepository:
             log_error(f"Error getting user by id {user_id}")
             return None
         
-        
+
+    async def get_principal(self, user_id: int) -> Optional[AuthPrincipal]:
+        """
+        Slim, cached projection of an active user for authenticated requests
+        """
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        try:
+            query = select(
+                *(getattr(User, field) for field in AuthPrincipal.model_fields)
+            ).where(User.id == user_id, User.is_active == True)
+            result = await self.db.execute(query)
+            row = result.one_or_none()
+            if row is None:
+                return None
+
+            principal = AuthPrincipal.model_validate(row._mapping)
+            principal_cache.put(principal)
+            return principal
+        except:
+            log_error(f"Error getting principal for user id {user_id}")
+            return None
+
     async def get_by_nic(self, nic: str) -> Optional[User]:
         try:
             query = select(User).where(User.nic == nic, User.is_active == True )
@@ -46,14 +111,34 @@ class UserRepository:
     async def create_user(self, user: User) -> Optional[User]:
         try:
             self.db.add(user)
-            await self.db.commit()
-            await self.db.refresh(user)
+            if self._in_unit_of_work:
+                # Assign the primary key without committing, and load the
+                # server-side defaults (no INSERT ... RETURNING on MySQL)
+                await self.db.flush()
+                await self.db.refresh(user)
+            else:
+                await self.db.commit()
+                await self.db.refresh(user)
             return user
         except Exception as e:
             log_info(f"Error creating user: {e}")
             log_error(f"Error creating user with email {user.email}")
             return None
         
+    async def deactivate_user(self, user_id: int) -> bool:
+        try:
+            query = (
+                update(User)
+                .where(User.id == user_id)
+                .values(is_active=False, updated_at=datetime.utcnow())
+            )
+            await self.db.execute(query)
+            await self._commit(lambda: principal_cache.invalidate(user_id))
+            return True
+        except:
+            log_error(f"Error deactivating user {user_id}")
+            return False
+
     # -------------------- OTP --------------------
     async def create_otp(
         self,
@@ -72,7 +157,6 @@ class UserRepository:
                         and_(
                             OTPVerification.email == email,
                             OTPVerification.otp_type == otp_type.value,
-                            OTPVerification.otp_reference == otp_reference,
                             OTPVerification.is_used == False,
                         )
                     )
@@ -88,7 +172,7 @@ class UserRepository:
                 expires_at=datetime.utcnow() + timedelta(minutes=expires_minutes),
             )
             self.db.add(otp_verification)
-            await self.db.commit()
+            await self._commit()
             return otp_verification
         except:
             log_error(f"Error creating OTP for email {email}")
@@ -100,8 +184,11 @@ class UserRepository:
         try:
             
             if email:
-                query = (
-                    select(OTPVerification)
+                # Pick the id from ix_otp_verifications_lookup alone (covering:
+                # InnoDB secondary entries carry the primary key), then read
+                # just that one row by primary key
+                newest = (
+                    select(OTPVerification.id)
                     .where(
                         and_(
                             OTPVerification.email == email,
@@ -111,7 +198,10 @@ class UserRepository:
                         )
                     )
                     .order_by(OTPVerification.created_at.desc())
+                    .limit(1)
+                    .subquery()
                 )
+                query = select(OTPVerification).join(newest, OTPVerification.id == newest.c.id)
                 result = await self.db.execute(query)
                 return result.scalar_one_or_none()
             return None
@@ -120,19 +210,53 @@ class UserRepository:
             return None
 
     async def mark_otp_used(self, otp_id: int) -> bool:
+        """
+        Consume an OTP (compare-and-set): False if it was already used, so
+        two concurrent verifications of the same code cannot both succeed
+        """
         try:
             query = (
                 update(OTPVerification)
-                .where(OTPVerification.id == otp_id)
+                .where(and_(OTPVerification.id == otp_id, OTPVerification.is_used == False))
                 .values(is_used=True, used_at=datetime.utcnow())
             )
-            await self.db.execute(query)
-            await self.db.commit()
-            return True
+            result = await self.db.execute(query)
+            await self._commit()
+            return result.rowcount == 1
         except:
             log_error(f"Error marking OTP {otp_id} as used")
             return False
 
+    async def purge_otps(self, after_id: int, batch_size: int) -> tuple[int, int]:
+        """
+        Delete used or expired OTPs among the next `batch_size` ids after `after_id`.
+        Walks the primary key so each batch touches a bounded id range and is
+        its own short transaction. Returns (last id scanned, rows deleted); the
+        last id equals `after_id` once the table has been fully walked.
+        """
+        try:
+            query = (
+                select(OTPVerification.id, OTPVerification.is_used, OTPVerification.expires_at)
+                .where(OTPVerification.id > after_id)
+                .order_by(OTPVerification.id)
+                .limit(batch_size)
+            )
+            rows = (await self.db.execute(query)).all()
+            now = datetime.utcnow()
+            ids = [row.id for row in rows if row.is_used or row.expires_at <= now]
+            if ids:
+                await self.db.execute(delete(OTPVerification).where(OTPVerification.id.in_(ids)))
+            # End the transaction after every batch, even an empty one, so no
+            # read snapshot stays open across the caller's pauses
+            await self._commit()
+            if not rows:
+                return after_id, 0
+            return rows[-1].id, len(ids)
+        except:
+            await self.db.rollback()
+            log_error(f"Error purging OTPs after id {after_id}")
+            return after_id, 0
+
     # -------------------- Verification flags --------------------
     async def mark_email_verified(self, email: str) -> bool:
         try:
@@ -142,37 +266,54 @@ class UserRepository:
                 .values(is_email_verified=True, updated_at=datetime.utcnow())
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit(lambda: principal_cache.invalidate_email(email))
             return True
         except:
             log_error(f"Error marking email verified for user: {email}")
             return False
 
-    # -------------------- Login attempts --------------------
-    async def increment_login_attempts(self, user_id: int) -> bool:
+    async def update_password_hash(self, user_id: int, password_hash: str) -> bool:
         try:
-            user = await self.get_by_id(user_id)
-            if not user:
-                return False
-
-            new_attempts = user.login_attempts + 1
-            locked_until = None
-            if new_attempts >= settings.MAX_LOGIN_ATTEMPTS:
-                locked_until = datetime.utcnow() + timedelta(
-                    minutes=settings.LOCKOUT_DURATION_MINUTES
-                )
+            query = (
+                update(User)
+                .where(User.id == user_id)
+                .values(password_hash=password_hash, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session="evaluate")
+            )
+            await self.db.execute(query)
+            await self._commit()
+            return True
+        except:
+            log_error(f"Error updating password hash for user {user_id}")
+            return False
 
+    # -------------------- Login attempts --------------------
+    async def increment_login_attempts(self, user_id: int, attempts: int = 1) -> bool:
+        """
+        Atomically add `attempts` failed logins and lock the account once the
+        total reaches MAX_LOGIN_ATTEMPTS, in a single UPDATE (no read-modify-write)
+        """
+        try:
+            now = datetime.utcnow()
+            lock_until = now + timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES)
             query = (
                 update(User)
                 .where(User.id == user_id)
-                .values(
-                    login_attempts=new_attempts,
-                    locked_until=locked_until,
-                    updated_at=datetime.utcnow(),
+                # locked_until first so the CASE sees the pre-increment count on every backend
+                .ordered_values(
+                    (
+                        User.locked_until,
+                        case(
+                            (User.login_attempts + attempts >= settings.MAX_LOGIN_ATTEMPTS, lock_until),
+                            else_=User.locked_until,
+                        ),
+                    ),
+                    (User.login_attempts, User.login_attempts + attempts),
+                    (User.updated_at, now),
                 )
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
             log_error(f"Error incrementing login attempts for user {user_id}")
@@ -186,12 +327,32 @@ class UserRepository:
                 .values(login_attempts=0, locked_until=None, updated_at=datetime.utcnow())
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
             log_error(f"Error resetting login attempts for user {user_id}")
             return False
 
+    async def record_successful_login(self, user_id: int) -> bool:
+        """
+        Reset login attempts and stamp last_login in a single UPDATE; a User
+        already loaded in this session gets the new values too
+        """
+        try:
+            now = datetime.utcnow()
+            query = (
+                update(User)
+                .where(User.id == user_id)
+                .values(login_attempts=0, locked_until=None, last_login=now, updated_at=now)
+                .execution_options(synchronize_session="evaluate")
+            )
+            await self.db.execute(query)
+            await self._commit(lambda: principal_cache.invalidate(user_id))
+            return True
+        except:
+            log_error(f"Error recording login for user {user_id}")
+            return False
+
     async def update_last_login(self, user_id: int) -> bool:
         try:
             query = (
@@ -200,7 +361,7 @@ class UserRepository:
                 .values(last_login=datetime.utcnow(), updated_at=datetime.utcnow())
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit(lambda: principal_cache.invalidate(user_id))
             return True
         except:
             log_error(f"Error updating last login for user {user_id}")
@@ -224,13 +385,13 @@ class UserRepository:
 
             refresh_token_record = RefreshToken(
                 user_id=user_id,
-                token=token,
+                token_hash=JWTUtils.hash_token(token),
                 expires_at=datetime.utcnow() + expires_delta,
                 user_agent=user_agent,
                 ip_address=ip_address,
             )
             self.db.add(refresh_token_record)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
             log_error(f"Error storing refresh token for user {user_id}")
@@ -238,11 +399,11 @@ class UserRepository:
 
     async def get_refresh_token(self, token: str) -> Optional[RefreshToken]:
         try:
-            query = select(RefreshToken).where(RefreshToken.token == token)
+            query = select(RefreshToken).where(RefreshToken.token_hash == JWTUtils.hash_token(token))
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except:
-            log_error(f"Error getting refresh token {token}")
+            log_error("Error getting refresh token")
             return None
 
     async def update_refresh_token_usage(self, token_id: int) -> bool:
@@ -253,7 +414,7 @@ class UserRepository:
                 .values(last_used_at=datetime.utcnow())
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
             log_error(f"Error updating usage for refresh token {token_id}")
@@ -263,16 +424,43 @@ class UserRepository:
         try:
             query = (
                 update(RefreshToken)
-                .where(RefreshToken.token == token)
+                .where(RefreshToken.token_hash == JWTUtils.hash_token(token))
                 .values(is_active=False)
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
-            log_error(f"Error deactivating refresh token {token}")
+            log_error("Error deactivating refresh token")
             return False
 
+    async def purge_refresh_tokens(self, batch_size: int) -> int:
+        """
+        Delete up to `batch_size` revoked or expired refresh tokens.
+        Both conditions are ranges on ix_refresh_tokens_is_active_expires_at,
+        so finding a batch does not scan live tokens. Returns rows deleted.
+        """
+        try:
+            query = (
+                select(RefreshToken.id)
+                .where(
+                    or_(
+                        RefreshToken.is_active == False,
+                        and_(RefreshToken.is_active == True, RefreshToken.expires_at <= datetime.utcnow()),
+                    )
+                )
+                .limit(batch_size)
+            )
+            ids = (await self.db.execute(query)).scalars().all()
+            if ids:
+                await self.db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+                await self._commit()
+            return len(ids)
+        except:
+            await self.db.rollback()
+            log_error("Error purging refresh tokens")
+            return 0
+
     async def deactivate_all_refresh_tokens(self, user_id: int) -> bool:
         try:
             query = (
@@ -281,7 +469,7 @@ class UserRepository:
                 .values(is_active=False)
             )
             await self.db.execute(query)
-            await self.db.commit()
+            await self._commit()
             return True
         except:
             log_error(f"Error deactivating all refresh tokens for user {user_id}")
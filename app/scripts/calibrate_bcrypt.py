@@ -0,0 +1,57 @@
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """
+    Median time in milliseconds to hash one password at the given bcrypt cost.
+    """
+    password = b"calibration-Password123"
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, samples: int = 3) -> tuple[int, dict[int, float]]:
+    """
+    Pick the highest bcrypt cost whose hash time on this machine stays within target_ms.
+    Never goes below MIN_ROUNDS; each extra round doubles the work, so measuring
+    stops as soon as the next cost would clearly exceed the target.
+    """
+    timings: dict[int, float] = {}
+    rounds = MIN_ROUNDS
+    timings[rounds] = measure_hash_ms(rounds, samples)
+
+    while rounds < MAX_ROUNDS and timings[rounds] * 2 <= target_ms:
+        rounds += 1
+        timings[rounds] = measure_hash_ms(rounds, samples)
+
+    if rounds > MIN_ROUNDS and timings[rounds] > target_ms:
+        rounds -= 1
+
+    return rounds, timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure bcrypt hash time on this hardware and recommend BCRYPT_ROUNDS."
+    )
+    parser.add_argument("--target-ms", type=float, default=250, help="Target hash/verify latency per login")
+    parser.add_argument("--samples", type=int, default=3, help="Hashes measured per cost")
+    args = parser.parse_args()
+
+    recommended, measured = calibrate_bcrypt_rounds(args.target_ms, args.samples)
+    for cost, ms in measured.items():
+        print(f"cost {cost:>2}: {ms:8.1f} ms")
+    if measured[recommended] > args.target_ms:
+        print(f"⚠️ Even the minimum cost {recommended} exceeds {args.target_ms:.0f} ms on this machine")
+    print(f"BCRYPT_ROUNDS={recommended}")
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import text
+
+from app.core.database import get_engine
+
+LOOKUP_INDEX = "ix_otp_verifications_lookup"
+LOOKUP_COLUMNS = "`email`, `otp_type`, `is_used`, `created_at`, `expires_at`"
+
+
+async def _index_exists(conn, table: str, index_name: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND INDEX_NAME = :index_name"
+        ),
+        {"table": table, "index_name": index_name},
+    )
+    return result.scalar() > 0
+
+
+async def migrate_otp_lookup_index(engine: AsyncEngine):
+    """
+    Replace the email-only index on otp_verifications with the composite lookup
+    index used by get_active_otp. Idempotent; the new index is built online
+    (ALGORITHM=INPLACE, LOCK=NONE) before the old one is dropped.
+    """
+    async with engine.connect() as conn:
+        if not await _index_exists(conn, "otp_verifications", LOOKUP_INDEX):
+            await conn.execute(text(
+                f"ALTER TABLE `otp_verifications` ADD INDEX `{LOOKUP_INDEX}` ({LOOKUP_COLUMNS}), "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            ))
+            await conn.commit()
+            print(f"✅ Added {LOOKUP_INDEX}")
+        else:
+            print(f"⚠️ {LOOKUP_INDEX} already exists")
+
+        # The lookup index starts with email, so the old single-column index is redundant
+        if await _index_exists(conn, "otp_verifications", "ix_otp_verifications_email"):
+            await conn.execute(text("ALTER TABLE `otp_verifications` DROP INDEX `ix_otp_verifications_email`"))
+            await conn.commit()
+            print("✅ Dropped ix_otp_verifications_email")
+
+
+async def main():
+    engine = get_engine()
+    try:
+        await migrate_otp_lookup_index(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the composite OTP lookup index to otp_verifications.")
+    parser.parse_args()
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import text
+
+from app.core.database import get_engine
+
+
+async def _column_exists(conn, table: str, column: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_NAME = :column"
+        ),
+        {"table": table, "column": column},
+    )
+    return result.scalar() > 0
+
+
+async def _unique_indexes_on(conn, table: str, column: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_NAME = :column "
+            "AND NON_UNIQUE = 0 AND INDEX_NAME <> 'PRIMARY'"
+        ),
+        {"table": table, "column": column},
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _backfill_token_hashes(conn, batch_size: int) -> int:
+    """
+    Fill token_hash for rows that lack it; SHA2() over the JWT matches JWTUtils.hash_token
+    """
+    backfilled = 0
+    while True:
+        result = await conn.execute(
+            text(
+                "UPDATE `refresh_tokens` SET `token_hash` = UNHEX(SHA2(`token`, 256)) "
+                "WHERE `token_hash` IS NULL AND `token` IS NOT NULL ORDER BY `id` LIMIT :batch_size"
+            ),
+            {"batch_size": batch_size},
+        )
+        await conn.commit()
+        backfilled += result.rowcount
+        if result.rowcount < batch_size:
+            return backfilled
+
+
+async def expand_refresh_token_hash(engine: AsyncEngine, batch_size: int = 10000):
+    """
+    Step 1, run BEFORE deploying the hashed-token code. Only additive changes,
+    so the code still running keeps working: token becomes nullable (the new
+    code no longer writes it), token_hash is added as a nullable column,
+    backfilled in primary-key-ordered batches and given its unique index
+    (rows the old code inserts meanwhile have a NULL hash, which the unique
+    index allows). Idempotent.
+    """
+    async with engine.connect() as conn:
+        await conn.execute(text("ALTER TABLE `refresh_tokens` MODIFY `token` VARCHAR(500) NULL"))
+        await conn.commit()
+        print("✅ refresh_tokens.token is nullable")
+
+        if not await _column_exists(conn, "refresh_tokens", "token_hash"):
+            await conn.execute(text(
+                "ALTER TABLE `refresh_tokens` ADD COLUMN `token_hash` BINARY(32) NULL AFTER `user_id`"
+            ))
+            await conn.commit()
+            print("✅ Added refresh_tokens.token_hash")
+
+        backfilled = await _backfill_token_hashes(conn, batch_size)
+        print(f"✅ Backfilled {backfilled} token hashes")
+
+        if "ux_refresh_tokens_token_hash" not in await _unique_indexes_on(conn, "refresh_tokens", "token_hash"):
+            await conn.execute(text(
+                "ALTER TABLE `refresh_tokens` ADD UNIQUE INDEX `ux_refresh_tokens_token_hash` (`token_hash`)"
+            ))
+            await conn.commit()
+            print("✅ Added unique index on refresh_tokens.token_hash")
+
+
+async def contract_refresh_token_hash(
+    engine: AsyncEngine, batch_size: int = 10000, clear_plaintext: bool = False
+):
+    """
+    Step 2, run AFTER every instance runs the hashed-token code: backfill the
+    rows the old code inserted since the expand step, make token_hash
+    mandatory and drop the wide unique index on the plaintext token. Idempotent.
+    """
+    async with engine.connect() as conn:
+        backfilled = await _backfill_token_hashes(conn, batch_size)
+        print(f"✅ Backfilled {backfilled} token hashes written since the expand step")
+
+        await conn.execute(text(
+            "ALTER TABLE `refresh_tokens` MODIFY `token_hash` BINARY(32) NOT NULL"
+        ))
+        await conn.commit()
+        print("✅ token_hash is NOT NULL")
+
+        for index_name in await _unique_indexes_on(conn, "refresh_tokens", "token"):
+            await conn.execute(text(f"ALTER TABLE `refresh_tokens` DROP INDEX `{index_name}`"))
+            await conn.commit()
+            print(f"✅ Dropped index {index_name} on refresh_tokens.token")
+
+        # Optionally stop keeping plaintext tokens at rest
+        if clear_plaintext:
+            cleared = 0
+            while True:
+                result = await conn.execute(
+                    text(
+                        "UPDATE `refresh_tokens` SET `token` = NULL "
+                        "WHERE `token` IS NOT NULL ORDER BY `id` LIMIT :batch_size"
+                    ),
+                    {"batch_size": batch_size},
+                )
+                await conn.commit()
+                cleared += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+            print(f"✅ Cleared {cleared} plaintext tokens")
+
+
+async def main(step: str, batch_size: int, clear_plaintext: bool):
+    engine = get_engine()
+    try:
+        if step == "expand":
+            await expand_refresh_token_hash(engine, batch_size)
+        else:
+            await contract_refresh_token_hash(engine, batch_size, clear_plaintext)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migrate refresh_tokens to a hashed, fixed-width token index: "
+        "'expand' before deploying the new code, 'contract' once it is fully rolled out."
+    )
+    parser.add_argument("step", choices=["expand", "contract"])
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument(
+        "--clear-plaintext", action="store_true", help="contract only: NULL out the legacy token column afterwards"
+    )
+    args = parser.parse_args()
+    if args.clear_plaintext and args.step != "contract":
+        parser.error("--clear-plaintext is only valid with the contract step")
+    asyncio.run(main(args.step, args.batch_size, args.clear_plaintext))
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import text
+
+from app.core.database import get_engine
+
+SWEEP_INDEX = "ix_refresh_tokens_is_active_expires_at"
+
+
+async def migrate_refresh_token_sweep_index(engine: AsyncEngine):
+    """
+    Add the (is_active, expires_at) index the refresh-token sweeper selects on.
+    Idempotent; built online so logins keep writing while it runs.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT COUNT(*) FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'refresh_tokens' AND INDEX_NAME = :index_name"
+            ),
+            {"index_name": SWEEP_INDEX},
+        )
+        if result.scalar() > 0:
+            print(f"⚠️ {SWEEP_INDEX} already exists")
+            return
+
+        await conn.execute(text(
+            f"ALTER TABLE `refresh_tokens` ADD INDEX `{SWEEP_INDEX}` (`is_active`, `expires_at`), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        ))
+        await conn.commit()
+        print(f"✅ Added {SWEEP_INDEX}")
+
+
+async def main():
+    engine = get_engine()
+    try:
+        await migrate_refresh_token_sweep_index(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the refresh-token sweeper index to refresh_tokens.")
+    parser.parse_args()
+    asyncio.run(main())
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Float, JSON, TIMESTAMP, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from sqlalchemy.sql import func
 
 Base = declarative_base()
 
@@ -87,4 +88,31 @@ class GeneticCondition(Base):
     __tablename__ = "genetic_conditions"
     id = Column(Integer, primary_key=True)
     condition_name = Column(String(255))
-    weight_number = Column(Float, default=0)
\ No newline at end of file
+    weight_number = Column(Float, default=0)
+
+
+class MasterDataVersion(Base):
+    """
+    Single-row counter the db.sql triggers bump for every logged change;
+    its row lock orders versions by commit
+    """
+    __tablename__ = "master_data_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class MasterDataChange(Base):
+    """
+    Change log written by the db.sql triggers on the suggestion tables;
+    `version` is the delta-sync cursor
+    """
+    __tablename__ = "master_data_changes"
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(1), nullable=False)  # 'I', 'U', 'D'
+    changed_at = Column(DateTime, default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_master_data_changes_table_version', 'table_name', 'version'),
+    )
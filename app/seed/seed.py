@@ -4,6 +4,8 @@ from app.seed.models import (
     AppVersion, SubscriptionPlan, Gender, UnitType, BloodType, SmokingLevel,
     AlcoholLevel, ExerciseLevel, MedicalConditionSuggestion, Allergy, GeneticCondition
 )
+from app.utils.version_cache import app_version_cache
+from app.modules.master_data.snapshot import master_data_snapshot
 from app.seed.data import (
     app_versions, subscription_plans, genders, unit_types, blood_types,
     smoking_levels, alcohol_levels, exercise_levels,
@@ -11,7 +13,7 @@ from app.seed.data import (
 )
 
 
-async def seed_table(session: AsyncSession, model, default_data: list[dict]):
+async def seed_table(session: AsyncSession, model, default_data: list[dict]) -> bool:
     result = await session.execute(select(model))
     existing = result.scalars().first()
     if not existing:
@@ -20,17 +22,22 @@ async def seed_table(session: AsyncSession, model, default_data: list[dict]):
         session.add_all(objs)
         await session.commit()
         print(f"{model.__tablename__} seeded successfully!")
+        return True
+    return False
 
 
 async def run_seeds(session: AsyncSession):
-    await seed_table(session, AppVersion, app_versions)
-    await seed_table(session, SubscriptionPlan, subscription_plans)
-    await seed_table(session, Gender, genders)
-    await seed_table(session, UnitType, unit_types)
-    await seed_table(session, BloodType, blood_types)
-    await seed_table(session, SmokingLevel, smoking_levels)
-    await seed_table(session, AlcoholLevel, alcohol_levels)
-    await seed_table(session, ExerciseLevel, exercise_levels)
-    await seed_table(session, MedicalConditionSuggestion, medical_conditions_suggestions)
-    await seed_table(session, Allergy, allergies)
-    await seed_table(session, GeneticCondition, genetic_conditions)
\ No newline at end of file
+    seeded = await seed_table(session, AppVersion, app_versions)
+    app_version_cache.invalidate()
+    seeded |= await seed_table(session, SubscriptionPlan, subscription_plans)
+    seeded |= await seed_table(session, Gender, genders)
+    seeded |= await seed_table(session, UnitType, unit_types)
+    seeded |= await seed_table(session, BloodType, blood_types)
+    seeded |= await seed_table(session, SmokingLevel, smoking_levels)
+    seeded |= await seed_table(session, AlcoholLevel, alcohol_levels)
+    seeded |= await seed_table(session, ExerciseLevel, exercise_levels)
+    seeded |= await seed_table(session, MedicalConditionSuggestion, medical_conditions_suggestions)
+    seeded |= await seed_table(session, Allergy, allergies)
+    seeded |= await seed_table(session, GeneticCondition, genetic_conditions)
+    if seeded:
+        master_data_snapshot.invalidate()
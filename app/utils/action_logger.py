@@ -1,36 +1,121 @@
+import asyncio
+from collections import deque
 from datetime import datetime, timezone
+from typing import Optional
 from sqlalchemy import insert
+from app.core.config import settings
 from app.core.database import get_sessionmaker
 from app.seed.models import ActionLog
 from app.utils.logger import log_info, log_error
 
-async def log_action(user_id: int, action: str, details: dict = None):
+
+class ActionLogWriter:
     """
-    Logs user action to file and database table 'action_logs'
+    Write-behind buffer for 'action_logs' rows.
+    Rows are bulk-inserted with a single executemany every `batch_size` rows or
+    every `flush_interval_ms`, whichever comes first. When the buffer is full
+    new rows are dropped (and counted) rather than slowing down requests.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_queue_size: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._rows: deque = deque()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+
+    def enqueue(self, row: dict) -> None:
+        if len(self._rows) >= self.max_queue_size:
+            self.dropped += 1
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._batch_ready.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and flush everything still buffered.
+        """
+        self._stopping = True
+        self._batch_ready.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        while self._rows:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            await self._write(batch)
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            Session = get_sessionmaker()
+            async with Session() as session:
+                async with session.begin():
+                    await session.execute(insert(ActionLog), batch)
+            self.written += len(batch)
+            self.batches += 1
+            self.last_batch_size = len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            log_error(f"Failed to write {len(batch)} action logs: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._rows),
+            "last_batch_size": self.last_batch_size,
+            "batches": self.batches,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+action_log_writer = ActionLogWriter(
+    batch_size=settings.ACTION_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.ACTION_LOG_FLUSH_INTERVAL_MS,
+    max_queue_size=settings.ACTION_LOG_MAX_QUEUE_SIZE,
+)
+
+
+def log_action(user_id: int, action: str, details: dict = None):
+    """
+    Logs user action to file and queues it for the 'action_logs' table.
+    Does not wait for the database; rows are written in batches by action_log_writer.
     """
     timestamp = datetime.now(timezone.utc)
-    entry = {
-        "timestamp": timestamp.isoformat(),
-        "user_id": user_id,
-        "action": action,
-        "details": details or {}
-    }
 
     # Log to file
-    log_info(f"ACTION: {entry}")
-
-    # Log to database
-    try:
-        Session = get_sessionmaker()
-        async with Session() as session:
-            async with session.begin():
-                stmt = insert(ActionLog).values(
-                    user_id=user_id,
-                    action_name=action,
-                    details=details or {},
-                    created_at=timestamp
-                )
-                await session.execute(stmt)
-
-    except Exception as e:
-        log_error(f"Failed to log action for user_id={user_id}, action={action}: {e}")
\ No newline at end of file
+    log_info("ACTION", user_id=user_id, action=action, details=details or {})
+
+    # Queue for database
+    action_log_writer.enqueue({
+        "user_id": user_id,
+        "action_name": action,
+        "details": details or {},
+        "created_at": timestamp,
+    })
@@ -0,0 +1,348 @@
+import asyncio
+import base64
+import copy
+import re
+import time
+from email.message import Message
+from email.utils import getaddresses
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.logger import log_error
+from app.utils.smtp_pool import SMTPDeliveryUnknown, smtp_ssl_context
+
+
+class SMTPReplyError(Exception):
+    def __init__(self, code: int, text: str):
+        super().__init__(f"{code} {text}")
+        self.code = code
+        self.text = text
+
+
+def serialize_message(message: Message) -> Tuple[str, List[str], bytes]:
+    """
+    Envelope sender, recipients and dot-stuffed DATA payload for a message
+    (the same addresses smtplib.send_message would use; Bcc is not transmitted)
+    """
+    from_addr = getaddresses([message["From"]])[0][1]
+    recipients = [addr for _, addr in getaddresses(message.get_all("To", []) + message.get_all("Cc", []) + message.get_all("Bcc", []))]
+
+    if message["Bcc"] is not None:
+        message = copy.copy(message)
+        del message["Bcc"]
+    payload = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+    payload = re.sub(rb"(?:\r\n|\n|\r(?!\n))", b"\r\n", payload)
+    payload = re.sub(rb"(?m)^\.", b"..", payload)
+    if not payload.endswith(b"\r\n"):
+        payload += b"\r\n"
+    return from_addr, recipients, payload + b".\r\n"
+
+
+class AsyncSMTPConnection:
+    """
+    One SMTP session on asyncio streams: implicit TLS (SMTP_SSL) or STARTTLS,
+    AUTH PLAIN/LOGIN, and RFC 2920 pipelining when the server offers it.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.extensions: dict = {}
+        self.last_used = time.monotonic()
+
+    @property
+    def pipelining(self) -> bool:
+        return "pipelining" in self.extensions
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError("SMTP server closed the connection")
+            lines.append(line[4:].strip().decode(errors="replace"))
+            if line[3:4] != b"-":
+                return int(line[:3]), "\n".join(lines)
+
+    async def _expect(self, *codes: int) -> str:
+        code, text = await self._read_reply()
+        if code not in codes:
+            raise SMTPReplyError(code, text)
+        return text
+
+    async def command(self, line: str, *codes: int) -> str:
+        self.writer.write(line.encode() + b"\r\n")
+        return await self._expect(*codes)
+
+    async def _ehlo(self) -> None:
+        text = await self.command("EHLO medvault", 250)
+        self.extensions = {}
+        for entry in text.split("\n")[1:]:
+            name, _, params = entry.partition(" ")
+            self.extensions[name.lower()] = params.upper()
+
+    async def connect(self) -> None:
+        plaintext = settings.SMTP_ALLOW_PLAINTEXT
+        implicit_tls = not plaintext and not settings.EMAIL_USE_TLS
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=smtp_ssl_context() if implicit_tls else None),
+            self.timeout,
+        )
+        await self._expect(220)
+        await self._ehlo()
+
+        if not plaintext and settings.EMAIL_USE_TLS:
+            if "starttls" not in self.extensions:
+                raise SMTPReplyError(502, "STARTTLS not offered by server")
+            await self.command("STARTTLS", 220)
+            await asyncio.wait_for(self.writer.start_tls(smtp_ssl_context(), server_hostname=self.host), self.timeout)
+            await self._ehlo()
+
+        if settings.SMTP_USERNAME:
+            await self._login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD or "")
+        self.last_used = time.monotonic()
+
+    async def _login(self, username: str, password: str) -> None:
+        mechanisms = self.extensions.get("auth", "").split()
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{username}\0{password}".encode()).decode()
+            await self.command(f"AUTH PLAIN {token}", 235)
+        else:
+            await self.command("AUTH LOGIN", 334)
+            await self.command(base64.b64encode(username.encode()).decode(), 334)
+            await self.command(base64.b64encode(password.encode()).decode(), 235)
+
+    async def noop(self) -> bool:
+        try:
+            await self.command("NOOP", 250)
+            return True
+        except Exception:
+            return False
+
+    def _envelope(self, from_addr: str, recipients: List[str]) -> bytes:
+        lines = [f"MAIL FROM:<{from_addr}>"] + [f"RCPT TO:<{addr}>" for addr in recipients] + ["DATA"]
+        return "".join(line + "\r\n" for line in lines).encode()
+
+    async def _read_envelope_replies(self, recipients: List[str]) -> None:
+        # Read every reply of the group before raising so the stream stays in sync
+        replies = [await self._read_reply() for _ in range(len(recipients) + 2)]
+        if replies[-1][0] != 354:
+            raise SMTPReplyError(*next((reply for reply in replies if reply[0] >= 400), replies[-1]))
+
+    async def send_batch(self, messages: List[Tuple[str, List[str], bytes]]) -> List[Optional[Exception]]:
+        """
+        Send messages back to back on this connection. With PIPELINING each
+        message costs one round trip: its body and the next message's
+        MAIL/RCPT/DATA group go out in one write (RFC 2920).
+        Returns one entry per message: None on success, else the error.
+        Only connection errors (not SMTPReplyError / SMTPDeliveryUnknown) are
+        safe to retry on a new connection.
+        """
+        results: List[Optional[Exception]] = []
+        try:
+            if self.pipelining and messages:
+                self.writer.write(self._envelope(*messages[0][:2]))
+
+            for index, (from_addr, recipients, payload) in enumerate(messages):
+                following = self._envelope(*messages[index + 1][:2]) if self.pipelining and index + 1 < len(messages) else b""
+                try:
+                    if self.pipelining:
+                        await self._read_envelope_replies(recipients)
+                    else:
+                        await self.command(f"MAIL FROM:<{from_addr}>", 250)
+                        for addr in recipients:
+                            await self.command(f"RCPT TO:<{addr}>", 250, 251)
+                        await self.command("DATA", 354)
+                except SMTPReplyError as e:
+                    # Transaction refused: reset and carry on with the next message
+                    results.append(e)
+                    self.writer.write(b"RSET\r\n" + following)
+                    await self._read_reply()
+                    continue
+
+                self.writer.write(payload + following)
+                try:
+                    code, text = await self._read_reply()
+                except Exception as e:
+                    results.append(SMTPDeliveryUnknown(f"No reply after DATA: {e!r}"))
+                    raise
+                results.append(None if code == 250 else SMTPReplyError(code, text))
+        except Exception as e:
+            # Connection is unusable; fail the rest of the batch
+            results.extend([e] * (len(messages) - len(results)))
+        self.last_used = time.monotonic()
+        return results
+
+    async def close(self) -> None:
+        if self.writer is None:
+            return
+        try:
+            self.writer.write(b"QUIT\r\n")
+            await asyncio.wait_for(self._read_reply(), 1.0)
+        except Exception:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+        self.writer = None
+
+
+class AsyncSMTPPool:
+    """
+    Native asyncio email transport: `size` worker tasks each own one connection
+    and drain a shared queue, sending up to `max_batch` queued messages per
+    pipelined batch. No threads are involved, so concurrency is bounded by
+    connections, not by executor size. Idle recycling, NOOP health checks and
+    a single reconnect-and-retry match SMTPConnectionPool.
+    """
+
+    def __init__(self, size: int, max_batch: int, idle_timeout: float, health_check_after: float):
+        self.size = size
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        # Metrics
+        self.connects = 0
+        self.recycled = 0
+        self.health_check_failures = 0
+        self.reconnects = 0
+        self.batches = 0
+        self.sent = 0
+        self.failed = 0
+
+    def _start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.size:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def send(self, message: Message) -> None:
+        """
+        Queue a message and wait until the server has accepted it
+        """
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((serialize_message(message), future))
+        await future
+
+    async def _connect(self) -> AsyncSMTPConnection:
+        connection = AsyncSMTPConnection(settings.SMTP_SERVER, settings.SMTP_PORT, settings.SMTP_TIMEOUT_SECONDS)
+        await connection.connect()
+        self.connects += 1
+        return connection
+
+    async def _ready(self, connection: Optional[AsyncSMTPConnection]) -> AsyncSMTPConnection:
+        if connection is not None:
+            idle_for = time.monotonic() - connection.last_used
+            if idle_for > self.idle_timeout:
+                self.recycled += 1
+                await connection.close()
+                connection = None
+            elif idle_for > self.health_check_after and not await connection.noop():
+                self.health_check_failures += 1
+                await connection.close()
+                connection = None
+        return connection or await self._connect()
+
+    async def _worker(self) -> None:
+        connection: Optional[AsyncSMTPConnection] = None
+        batch: list = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                messages = [item[0] for item in batch]
+
+                try:
+                    connection = await self._ready(connection)
+                    results = await connection.send_batch(messages)
+                    retry = [
+                        i for i, result in enumerate(results)
+                        if result is not None and not isinstance(result, (SMTPReplyError, SMTPDeliveryUnknown))
+                    ]
+                    if retry:
+                        # Dropped connection: reconnect once and resend what did not go out
+                        self.reconnects += 1
+                        await connection.close()
+                        connection = await self._connect()
+                        for i, result in zip(retry, await connection.send_batch([messages[i] for i in retry])):
+                            results[i] = result
+                except Exception as e:
+                    if connection is not None:
+                        await connection.close()
+                    connection = None
+                    results = [e] * len(batch)
+
+                self.batches += 1
+                for (_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if result is None:
+                        self.sent += 1
+                        future.set_result(None)
+                    else:
+                        self.failed += 1
+                        future.set_exception(result)
+        finally:
+            # Cancelled mid-batch (shutdown): don't leave senders waiting
+            self._fail_pending(batch)
+            if connection is not None:
+                await connection.close()
+
+    def _fail_pending(self, items) -> None:
+        for _, future in items:
+            if not future.done():
+                self.failed += 1
+                future.set_exception(ConnectionError("SMTP transport closed"))
+
+    async def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                log_error(f"SMTP worker failed during shutdown: {e}")
+        self._workers = []
+
+        # Messages still queued will never be sent; release their senders
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail_pending(pending)
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "connects": self.connects,
+            "recycled": self.recycled,
+            "health_check_failures": self.health_check_failures,
+            "reconnects": self.reconnects,
+            "batches": self.batches,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+
+async_smtp_pool = AsyncSMTPPool(
+    size=settings.SMTP_POOL_SIZE,
+    max_batch=settings.SMTP_PIPELINE_MAX_BATCH,
+    idle_timeout=settings.SMTP_POOL_IDLE_TIMEOUT_SECONDS,
+    health_check_after=settings.SMTP_POOL_HEALTH_CHECK_AFTER_SECONDS,
+)
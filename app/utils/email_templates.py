@@ -0,0 +1,135 @@
+import html
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+
+from app.core.config import settings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template pre-split into static segments and placeholder slots.
+    Rendering copies the segment list, fills the slots and joins once, so the
+    Python work per render is proportional to the number of placeholders.
+    """
+
+    def __init__(self, source: str, autoescape: bool):
+        self._pieces: List[str] = PLACEHOLDER.split(source)  # even: static text, odd: placeholder names
+        self._slots: List[Tuple[int, str]] = [(i, self._pieces[i]) for i in range(1, len(self._pieces), 2)]
+        self.placeholders = frozenset(name for _, name in self._slots)
+        self.autoescape = autoescape
+
+    def render(self, context: Mapping[str, object]) -> str:
+        pieces = self._pieces.copy()
+        if self.autoescape:
+            for index, name in self._slots:
+                pieces[index] = html.escape(str(context[name]))
+        else:
+            for index, name in self._slots:
+                pieces[index] = str(context[name])
+        return "".join(pieces)
+
+
+def html_to_text(source: str) -> str:
+    """
+    Plain-text alternative for an HTML template. Placeholders pass through
+    untouched, so the result is itself a template.
+    """
+    text = re.sub(r"(?is)<(head|style|script)\b.*?</\1>", "", source)
+    text = re.sub(r'(?is)<a\b[^>]*href="([^"]*)"[^>]*>(.*?)</a>', r"\2 (\1)", text)
+    text = re.sub(r"(?i)<br\s*/?>", "\n", text)
+    text = re.sub(r"(?i)<li\b[^>]*>", "\n- ", text)
+    text = re.sub(r"(?i)</(p|div|h[1-6]|li|tr|table)>", "\n", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = html.unescape(text)
+
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    text = "\n".join(lines).strip()
+    return re.sub(r"\n{3,}", "\n\n", text) + "\n"
+
+
+class EmailTemplate:
+    def __init__(self, name: str, source: str, mtime: float):
+        self.name = name
+        self.mtime = mtime
+        self.html = CompiledTemplate(source, autoescape=True)
+        self.text = CompiledTemplate(html_to_text(source), autoescape=False)
+
+
+class EmailTemplateEngine:
+    """
+    Loads templates from EMAIL_TEMPLATES_DIR once and keeps them compiled.
+    With `auto_reload` (development) each lookup stats the file and recompiles
+    it when its mtime changes; otherwise the file system is never touched again.
+    """
+
+    def __init__(self, directory: str, auto_reload: bool):
+        path = Path(directory)
+        self.directory = path if path.is_absolute() else PROJECT_ROOT / path
+        self.auto_reload = auto_reload
+        self._templates: Dict[str, EmailTemplate] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.compiles = 0
+        self.reloads = 0
+        self.renders = 0
+        self.render_ms = 0.0
+
+    def _load(self, name: str) -> EmailTemplate:
+        path = self.directory / name
+        mtime = os.stat(path).st_mtime
+        template = EmailTemplate(name, path.read_text(encoding="utf-8"), mtime)
+        self.compiles += 1
+        return template
+
+    def get(self, name: str) -> EmailTemplate:
+        template = self._templates.get(name)
+        if template is not None and not self.auto_reload:
+            return template
+
+        with self._lock:
+            template = self._templates.get(name)
+            if template is None:
+                template = self._templates[name] = self._load(name)
+            elif self.auto_reload and os.stat(self.directory / name).st_mtime != template.mtime:
+                template = self._templates[name] = self._load(name)
+                self.reloads += 1
+            return template
+
+    def render(self, name: str, **context) -> Tuple[str, str]:
+        """
+        Render a template to (html, text)
+        """
+        start = time.perf_counter()
+        template = self.get(name)
+        rendered = template.html.render(context), template.text.render(context)
+        self.renders += 1
+        self.render_ms += (time.perf_counter() - start) * 1000
+        return rendered
+
+    def preload(self) -> None:
+        for path in sorted(self.directory.glob("*.html")):
+            self.get(path.name)
+
+    def stats(self) -> dict:
+        return {
+            "templates": len(self._templates),
+            "auto_reload": self.auto_reload,
+            "compiles": self.compiles,
+            "reloads": self.reloads,
+            "renders": self.renders,
+            "avg_render_us": round(self.render_ms * 1000 / self.renders, 2) if self.renders else 0.0,
+        }
+
+
+email_templates = EmailTemplateEngine(
+    settings.EMAIL_TEMPLATES_DIR,
+    auto_reload=settings.ENVIRONMENT == "development",
+)
@@ -1,10 +1,83 @@
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple
 from fastapi import HTTPException, status
 from app.core.config import settings
+import hashlib
 import secrets
 import string
+import time
+
+
+class TokenClaims(NamedTuple):
+    type: Optional[str]
+    subject: Optional[str]
+    expires_at: Optional[float]  # Unix timestamp
+    payload: Dict[str, Any]
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of decoded token payloads keyed by a SHA-256 digest of the token.
+    Entries are only served until the token's own 'exp'.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.decode_ms_total = 0.0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        payload = self._entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, key: bytes, payload: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def record_decode(self, elapsed_ms: float) -> None:
+        self.decodes += 1
+        self.decode_ms_total += elapsed_ms
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "decodes": self.decodes,
+            "avg_decode_ms": round(self.decode_ms_total / self.decodes, 4) if self.decodes else None,
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.JWT_CACHE_MAX_SIZE)
 
 
 class JWTUtils:
@@ -57,33 +130,63 @@ class JWTUtils:
     @staticmethod
     def verify_token(token: str) -> Dict[str, Any]:
         """
-        Verify and decode JWT token
+        Verify and decode JWT token.
+        Verified payloads are cached until the token expires, so repeat calls
+        for the same token skip the signature check.
         """
+        key = JWTUtils.hash_token(token)
+        payload = verified_token_cache.get(key)
+        if payload is not None:
+            return dict(payload)
+
         try:
+            start = time.perf_counter()
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
-            return payload
+            verified_token_cache.record_decode((time.perf_counter() - start) * 1000)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        verified_token_cache.put(key, payload)
+        return dict(payload)
+
+    @staticmethod
+    def hash_token(token: str) -> bytes:
+        """
+        Fixed-width 32-byte SHA-256 digest used to index and look up stored tokens
+        """
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @staticmethod
+    def decode_token(token: str) -> TokenClaims:
+        """
+        Verify a token once and return its type, subject and expiry together
+        """
+        payload = JWTUtils.verify_token(token)
+        return TokenClaims(
+            type=payload.get("type"),
+            subject=payload.get("sub"),
+            expires_at=payload.get("exp"),
+            payload=payload,
+        )
+
     @staticmethod
     def get_current_user_id(token: str) -> int:
         """
         Extract user ID from JWT token
         """
-        payload = JWTUtils.verify_token(token)
-        user_id: int = payload.get("sub")
+        user_id = JWTUtils.decode_token(token).subject
 
         if user_id is None:
             raise HTTPException(
@@ -123,16 +226,12 @@ class JWTUtils:
         Check if token is expired without raising exception
         """
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            exp_timestamp = payload.get("exp")
+            exp_timestamp = JWTUtils.decode_token(token).expires_at
             if exp_timestamp is None:
                 return True
 
-            exp_datetime = datetime.fromtimestamp(exp_timestamp)
-            return datetime.utcnow() > exp_datetime
-        except (jwt.ExpiredSignatureError, jwt.JWTError):
+            return time.time() > exp_timestamp
+        except HTTPException:
             return True
 
     @staticmethod
@@ -141,9 +240,6 @@ class JWTUtils:
         Get token type (access or refresh) from token
         """
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            return payload.get("type")
-        except jwt.JWTError:
+            return JWTUtils.decode_token(token).type
+        except HTTPException:
             return None
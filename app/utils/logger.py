@@ -1,28 +1,140 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
+import orjson
+
+from app.core.config import settings
+
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# File logger with rotation
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render records as one orjson-encoded object per line.
+    Keyword context passed to log_info/log_error becomes top-level fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        context = getattr(record, "context", None)
+        if context:
+            entry.update(context)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode("utf-8")
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking handler: hands records to the listener thread and drops them
+    (counting the drop) instead of blocking the event loop when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; only freeze what can change later
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    QueueListener whose stop() works on a full bounded queue: the stop
+    sentinel waits for the listener to make room instead of raising
+    queue.Full, so every record already queued is written first.
+    Tracks its own running state, so stop() is safe to call twice.
+    """
+
+    sentinel_timeout = 5.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        super().stop()
+
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=self.sentinel_timeout)
+        except queue.Full:
+            # Listener is not keeping up at all: drop the oldest record to make room
+            try:
+                self.queue.get_nowait()
+                queue_handler.dropped += 1
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(self._sentinel)
+
+
+# File logger with rotation, driven by a background listener thread
 file_handler = RotatingFileHandler(
     filename=os.path.join(LOG_DIR, "app.log"),
     maxBytes=5*1024*1024,  # 5 MB
     backupCount=5,
 )
-formatter = logging.Formatter(
-    '%(asctime)s | %(levelname)s | %(name)s | %(message)s'
-)
-file_handler.setFormatter(formatter)
+file_handler.setFormatter(JSONFormatter())
+
+log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_MAX_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+listener = DrainingQueueListener(log_queue, file_handler, respect_handler_level=True)
+listener.start()
 
 logger = logging.getLogger("medvault_logger")
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
+logger.addHandler(queue_handler)
 logger.propagate = False
 
-def log_info(message: str):
-    logger.info(message)
 
-def log_error(message: str):
-    logger.error(message)
\ No newline at end of file
+def shutdown_logger():
+    """
+    Drain the queue to disk and stop the listener thread. Safe to call twice.
+    """
+    listener.stop()
+    file_handler.flush()
+
+atexit.register(shutdown_logger)
+
+
+def logger_stats() -> dict:
+    return {
+        "queue_depth": log_queue.qsize(),
+        "queue_max_size": log_queue.maxsize,
+        "dropped": queue_handler.dropped,
+    }
+
+def log_info(message: str, **context):
+    logger.info(message, extra={"context": context} if context else None)
+
+def log_error(message: str, **context):
+    logger.error(message, extra={"context": context} if context else None)
@@ -0,0 +1,56 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a periodic sleep.
+    Sustained lag means something (e.g. CPU-bound work) is blocking the loop.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics (milliseconds)
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.avg_lag_ms = 0.0
+        self.samples = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max((time.perf_counter() - start - self.interval) * 1000, 0.0)
+
+            self.samples += 1
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            # Exponential moving average so the figure tracks recent load
+            self.avg_lag_ms = lag_ms if self.samples == 1 else self.avg_lag_ms * 0.9 + lag_ms * 0.1
+
+    def stats(self) -> dict:
+        return {
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "avg_lag_ms": round(self.avg_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "samples": self.samples,
+        }
+
+
+event_loop_lag_monitor = EventLoopLagMonitor()
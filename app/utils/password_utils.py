@@ -1,10 +1,99 @@
 import bcrypt
+from fastapi import HTTPException, status
 from app.core.config import settings
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import os
 import secrets
 import string
+import time
 from typing import Optional
 
 
+class PasswordHashPool:
+    """
+    Bounded executor for bcrypt work so hashing never runs on the event loop.
+    At most `max_concurrency` calls are in flight or queued; callers that cannot
+    get a slot within `queue_timeout` seconds are rejected with 503.
+    """
+
+    def __init__(self, kind: str, workers: int, max_concurrency: int, queue_timeout: float):
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers * 2
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                # bcrypt releases the GIL while hashing, so threads scale with cores too
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+            )
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_ms += (time.perf_counter() - start) * 1000
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_ms / self.completed, 3) if self.completed else None,
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
+
+
 class PasswordUtils:
     @staticmethod
     def hash_password(password: str) -> str:
@@ -12,15 +101,12 @@ class PasswordUtils:
         if not isinstance(password, str):
             raise TypeError(f"Expected str, got {type(password)}")
 
-        print(f"[DEBUG] Password type: {type(password)}, value: {password}, length: {len(password)}")
-
         # Encode to bytes
         password_bytes = password.encode("utf-8")
-        print(f"[DEBUG] Encoded length: {len(password_bytes)} bytes")
 
         # Bcrypt will automatically handle the 72-byte limit
         # Generate salt and hash
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         
         # Return as string
@@ -34,6 +120,18 @@ class PasswordUtils:
         
         return bcrypt.checkpw(password_bytes, hashed_bytes)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a password on the bcrypt pool without blocking the event loop"""
+        return await password_hash_pool.run(PasswordUtils.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the bcrypt pool without blocking the event loop"""
+        return await password_hash_pool.run(
+            PasswordUtils.verify_password, plain_password, hashed_password
+        )
+
     @staticmethod
     def generate_random_password(length: int = 12) -> str:
         """Generate a secure random password"""
@@ -85,9 +183,15 @@ class PasswordUtils:
 
         return len(issues) == 0, issues
 
+    @staticmethod
+    def get_hash_rounds(hashed_password: str) -> Optional[int]:
+        """Parse the bcrypt cost from a '$2b$<cost>$...' hash"""
+        parts = (hashed_password or "").split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
     @staticmethod
     def needs_rehash(hashed_password: str) -> bool:
-        """Check if password hash needs to be updated"""
-        # With direct bcrypt, you could check the cost factor
-        # For now, return False unless you implement version checking
-        return False
\ No newline at end of file
+        """Check if password hash was made with a cost other than BCRYPT_ROUNDS"""
+        return PasswordUtils.get_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
\ No newline at end of file
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils.logger import log_info, log_error
+
+
+class PeriodicTask:
+    """
+    Runs an async maintenance job every `interval_seconds` in the background.
+    The job returns a dict of figures (e.g. {"deleted": 120}); the latest result
+    is kept for the metrics endpoint and the `total_fields` are summed across runs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[dict]],
+        interval_seconds: float,
+        enabled: bool = True,
+        total_fields: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.job = job
+        self.interval = interval_seconds
+        self.enabled = enabled
+        self.total_fields = total_fields
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: Optional[float] = None
+        self.last_duration_ms = 0.0
+        self.last_result: dict = {}
+        self.totals: Dict[str, int] = {field: 0 for field in total_fields}
+
+    def start(self) -> None:
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    async def run_once(self) -> dict:
+        start = time.perf_counter()
+        try:
+            result = await self.job()
+        except Exception as e:
+            self.failures += 1
+            log_error(f"Periodic task {self.name} failed: {e}")
+            return {}
+        finally:
+            self.runs += 1
+            self.last_run_at = time.time()
+            self.last_duration_ms = (time.perf_counter() - start) * 1000
+
+        self.last_result = result
+        for field in self.total_fields:
+            self.totals[field] += result.get(field, 0)
+        log_info(f"Periodic task {self.name} finished", duration_ms=round(self.last_duration_ms, 1), **result)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": round(self.last_duration_ms, 3),
+            "last_result": self.last_result,
+            "totals": self.totals,
+        }
@@ -1,11 +1,237 @@
 import aiohttp
 import asyncio
-from typing import Optional, Dict, Any
+import time
+import jwt
+from typing import Optional, Dict, Any, List, Tuple
 from app.core.config import settings
 from app.utils.logger import log_info, log_error
 import json
 
 
+class RateLimiter:
+    """
+    Token bucket: at most `rate` acquisitions per second, with bursts of up
+    to `rate` (at least 1). Waiters are served in arrival order. rate <= 0
+    disables it.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(float(rate), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Metrics
+        self.waits = 0
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class DialogClient:
+    """
+    Long-lived Dialog API client: one pooled aiohttp session (keep-alive, so
+    TLS is negotiated once per connection) and a cached auth token.
+    The token is reused until `refresh_margin` seconds before it expires and is
+    refreshed single-flight: concurrent senders wait on one login call. A 401
+    on send drops the token and the send is retried once with a fresh one.
+    Sends are capped at `max_concurrency` in flight and `rate_limit` per
+    second, whichever path they come from.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        timeout: float,
+        token_ttl: float,
+        refresh_margin: float,
+        max_concurrency: int = 0,
+        rate_limit: float = 0,
+    ):
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency or pool_size
+        self.timeout = timeout
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0  # time.monotonic()
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        # Metrics
+        self.logins = 0
+        self.login_failures = 0
+        self.token_hits = 0
+        self.unauthorized_retries = 0
+        self.sent = 0
+        self.failed = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    def _token_lifetime(self, result: Dict[str, Any], token: str) -> float:
+        """
+        Seconds the token is valid for: 'expires_in' from the login response,
+        else the JWT 'exp' claim, else the configured DIALOG_TOKEN_TTL_SECONDS
+        """
+        if result.get("expires_in"):
+            return float(result["expires_in"])
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+            if exp:
+                return float(exp) - time.time()
+        except jwt.InvalidTokenError:
+            pass
+        return self.token_ttl
+
+    def _token_valid(self) -> bool:
+        return self._token is not None and time.monotonic() < self._token_expires_at - self.refresh_margin
+
+    async def _login(self) -> Optional[str]:
+        login_url = f"{settings.DIALOG_BASE_URL}{settings.DIALOG_LOGIN_ENDPOINT}"
+        login_data = {
+            "username": settings.DIALOG_USERNAME,
+            "password": settings.DIALOG_PASSWORD,
+        }
+
+        try:
+            async with self._get_session().post(login_url, json=login_data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    token = result.get("access_token") or result.get("token")
+                    if token:
+                        self.logins += 1
+                        self._token = token
+                        self._token_expires_at = time.monotonic() + self._token_lifetime(result, token)
+                        log_info("Successfully obtained Dialog auth token")
+                        return token
+                log_error(f"Failed to authenticate with Dialog API: {response.status}")
+        except Exception as e:
+            log_error(f"Error authenticating with Dialog API: {str(e)}")
+
+        self.login_failures += 1
+        return None
+
+    async def get_token(self) -> Optional[str]:
+        if self._token_valid():
+            self.token_hits += 1
+            return self._token
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            # Another caller may have refreshed it while we waited
+            if self._token_valid():
+                self.token_hits += 1
+                return self._token
+            return await self._login()
+
+    def invalidate_token(self, token: str) -> None:
+        if self._token == token:
+            self._token = None
+
+    async def send_sms(self, normalized_phone: str, message: str) -> bool:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._slots:
+            await self.rate_limiter.acquire()
+            return await self._send_sms(normalized_phone, message)
+
+    async def _send_sms(self, normalized_phone: str, message: str) -> bool:
+        sms_url = f"{settings.DIALOG_BASE_URL}{settings.DIALOG_SMS_ENDPOINT}"
+        sms_data = {
+            "to": normalized_phone,
+            "message": message,
+            "from": "MedVault",  # Sender ID
+        }
+
+        for attempt in range(2):
+            if attempt:
+                # The retry is another provider request; it counts against the rate limit
+                await self.rate_limiter.acquire()
+            auth_token = await self.get_token()
+            if not auth_token:
+                self.failed += 1
+                return False
+
+            try:
+                async with self._get_session().post(
+                    sms_url, json=sms_data, headers={"Authorization": f"Bearer {auth_token}"}
+                ) as response:
+                    if response.status in [200, 201, 202]:
+                        self.sent += 1
+                        log_info(f"SMS sent successfully to {normalized_phone}")
+                        return True
+                    if response.status == 401 and attempt == 0:
+                        # Token revoked or expired early: log in again and retry once
+                        self.unauthorized_retries += 1
+                        self.invalidate_token(auth_token)
+                        continue
+                    error_text = await response.text()
+                    log_error(
+                        f"Failed to send SMS to {normalized_phone}: {response.status} - {error_text}"
+                    )
+                    break
+            except Exception as e:
+                log_error(f"Error sending SMS to {normalized_phone}: {str(e)}")
+                break
+
+        self.failed += 1
+        return False
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stats(self) -> dict:
+        return {
+            "session_open": self._session is not None and not self._session.closed,
+            "token_cached": self._token_valid(),
+            "max_concurrency": self.max_concurrency,
+            "rate_limit": self.rate_limiter.rate,
+            "rate_limited_waits": self.rate_limiter.waits,
+            "logins": self.logins,
+            "login_failures": self.login_failures,
+            "token_hits": self.token_hits,
+            "unauthorized_retries": self.unauthorized_retries,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+
+dialog_client = DialogClient(
+    pool_size=settings.SMS_HTTP_POOL_SIZE,
+    timeout=settings.SMS_HTTP_TIMEOUT_SECONDS,
+    token_ttl=settings.DIALOG_TOKEN_TTL_SECONDS,
+    refresh_margin=settings.DIALOG_TOKEN_REFRESH_MARGIN_SECONDS,
+    max_concurrency=settings.SMS_MAX_CONCURRENCY,
+    rate_limit=settings.SMS_RATE_LIMIT_PER_SECOND,
+)
+
+
 class SMSUtils:
     """
     SMS utility class for sending SMS messages via Dialog provider
@@ -14,7 +240,7 @@ class SMSUtils:
     @staticmethod
     async def _get_dialog_auth_token() -> Optional[str]:
         """
-        Get authentication token from Dialog API
+        Get authentication token from Dialog API (cached until close to expiry)
         """
         if not all(
             [
@@ -27,34 +253,7 @@ class SMSUtils:
             log_error("Dialog SMS configuration is incomplete")
             return None
 
-        login_url = f"{settings.DIALOG_BASE_URL}{settings.DIALOG_LOGIN_ENDPOINT}"
-
-        login_data = {
-            "username": settings.DIALOG_USERNAME,
-            "password": settings.DIALOG_PASSWORD,
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    login_url,
-                    json=login_data,
-                    headers={"Content-Type": "application/json"},
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        token = result.get("access_token") or result.get("token")
-                        log_info("Successfully obtained Dialog auth token")
-                        return token
-                    else:
-                        log_error(
-                            f"Failed to authenticate with Dialog API: {response.status}"
-                        )
-                        return None
-
-        except Exception as e:
-            log_error(f"Error authenticating with Dialog API: {str(e)}")
-            return None
+        return await dialog_client.get_token()
 
     @staticmethod
     async def send_sms_dialog(phone_number: str, message: str) -> bool:
@@ -65,14 +264,50 @@ class SMSUtils:
             log_error("Dialog SMS endpoint not configured")
             return False
 
-        # Get authentication token
-        auth_token = await SMSUtils._get_dialog_auth_token()
-        if not auth_token:
+        if not SMSUtils.is_sms_configured():
+            log_error("Dialog SMS configuration is incomplete")
             return False
 
-        sms_url = f"{settings.DIALOG_BASE_URL}{settings.DIALOG_SMS_ENDPOINT}"
+        normalized_phone = SMSUtils.normalize_phone_number(phone_number)
+        return await dialog_client.send_sms(normalized_phone, message)
+
+    @staticmethod
+    async def send_bulk_sms(messages: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Send many (phone_number, message) pairs concurrently through Dialog,
+        within SMS_MAX_CONCURRENCY and SMS_RATE_LIMIT_PER_SECOND.
+        Returns one result per pair, in input order
+        """
+        results = [
+            {"phone_number": phone_number, "normalized_phone": SMSUtils.normalize_phone_number(phone_number), "success": False}
+            for phone_number, _ in messages
+        ]
+        if not messages:
+            return results
+
+        if not settings.DIALOG_SMS_ENDPOINT or not SMSUtils.is_sms_configured():
+            log_error("Dialog SMS configuration is incomplete")
+            return results
 
-        # Normalize phone number (remove any non-digit characters except +)
+        sent = await asyncio.gather(
+            *(dialog_client.send_sms(result["normalized_phone"], message) for result, (_, message) in zip(results, messages)),
+            return_exceptions=True,
+        )
+        for result, success in zip(results, sent):
+            result["success"] = success is True
+            if isinstance(success, Exception):
+                log_error(f"Error sending SMS to {result['normalized_phone']}: {str(success)}")
+
+        log_info(f"Bulk SMS: {sum(r['success'] for r in results)}/{len(results)} sent")
+        return results
+
+    @staticmethod
+    def normalize_phone_number(phone_number: str) -> str:
+        """
+        Normalize a phone number for sending: keep digits and +, and default
+        to the Sri Lankan country code (+94)
+        """
+        # Remove any non-digit characters except +
         normalized_phone = "".join(
             char for char in phone_number if char.isdigit() or char == "+"
         )
@@ -86,35 +321,7 @@ class SMSUtils:
                 # Add default country code
                 normalized_phone = "+94" + normalized_phone
 
-        sms_data = {
-            "to": normalized_phone,
-            "message": message,
-            "from": "MedVault",  # Sender ID
-        }
-
-        headers = {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json",
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    sms_url, json=sms_data, headers=headers
-                ) as response:
-                    if response.status in [200, 201, 202]:
-                        log_info(f"SMS sent successfully to {phone_number}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        log_error(
-                            f"Failed to send SMS to {phone_number}: {response.status} - {error_text}"
-                        )
-                        return False
-
-        except Exception as e:
-            log_error(f"Error sending SMS to {phone_number}: {str(e)}")
-            return False
+        return normalized_phone
 
     @staticmethod
     async def send_otp_sms(
@@ -199,6 +406,15 @@ class SMSUtils:
 
         return await SMSUtils.send_sms_dialog(phone_number, message)
 
+    @staticmethod
+    async def send_bulk_security_alert_sms(phone_numbers: List[str], action: str) -> List[Dict[str, Any]]:
+        """
+        Send the same security alert to many recipients
+        """
+        message = f"MedVault Security Alert: {action} was performed on your account. If this wasn't you, please contact support immediately."
+
+        return await SMSUtils.send_bulk_sms([(phone_number, message) for phone_number in phone_numbers])
+
     @staticmethod
     def is_sms_configured() -> bool:
         """
@@ -0,0 +1,242 @@
+import asyncio
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+# Errors after which the connection is dead and the message can be retried on a fresh one
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+# Server refused the transaction (4xx/5xx on MAIL/RCPT/DATA): the message failed,
+# but the session is intact and can be reused after RSET
+REPLY_ERRORS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+class SMTPDeliveryUnknown(Exception):
+    """
+    The message body was sent but no final reply arrived (timeout or dropped
+    connection): the server may have queued it, so it must not be resent.
+    """
+
+
+class _DataTracking:
+    """
+    Records on the connection whether DATA was issued for the current message
+    """
+
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+
+class PooledSMTP(_DataTracking, smtplib.SMTP):
+    pass
+
+
+class PooledSMTP_SSL(_DataTracking, smtplib.SMTP_SSL):
+    pass
+
+
+def smtp_ssl_context() -> ssl.SSLContext:
+    return ssl.create_default_context(cafile=settings.SMTP_CA_FILE or None)
+
+
+def create_smtp_connection() -> smtplib.SMTP:
+    """
+    Open an authenticated SMTP connection with proper SSL/TLS configuration
+    """
+    if not settings.SMTP_SERVER or (
+        not settings.SMTP_ALLOW_PLAINTEXT and not all([settings.SMTP_USERNAME, settings.SMTP_PASSWORD])
+    ):
+        raise ValueError("SMTP configuration is incomplete")
+
+    timeout = settings.SMTP_TIMEOUT_SECONDS
+    if settings.SMTP_ALLOW_PLAINTEXT:
+        # Local stand-in servers only (benchmarks, load tests)
+        server = PooledSMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=timeout)
+    elif settings.EMAIL_USE_TLS:
+        server = PooledSMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=timeout)
+        server.starttls(context=smtp_ssl_context())
+    else:
+        server = PooledSMTP_SSL(
+            settings.SMTP_SERVER, settings.SMTP_PORT, timeout=timeout, context=smtp_ssl_context()
+        )
+
+    if settings.SMTP_USERNAME:
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    return server
+
+
+class SMTPConnectionPool:
+    """
+    Process-wide pool of authenticated smtplib connections.
+    At most `size` sends hold a connection at once (a semaphore gates
+    checkout, whichever thread calls send), so at most `size` connections
+    exist. Idle connections are reused most-recent-first;
+    ones idle longer than `idle_timeout` are closed, ones idle longer than
+    `health_check_after` are probed with NOOP before reuse, and a send that
+    hits a dropped connection before DATA is retried once on a fresh one
+    (after DATA it raises SMTPDeliveryUnknown instead, as the server may
+    already have the message). A refused message keeps its connection
+    (reset with RSET).
+    """
+
+    def __init__(self, size: int, idle_timeout: float, health_check_after: float):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Metrics
+        self.connects = 0
+        self.reuses = 0
+        self.recycled = 0
+        self.health_check_failures = 0
+        self.reconnects = 0
+        self.sent = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="smtp")
+        return self._executor
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = create_smtp_connection()
+        self.connects += 1
+        return server
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, released_at = self._idle.pop()
+
+            idle_for = time.monotonic() - released_at
+            if idle_for > self.idle_timeout:
+                self.recycled += 1
+                self._close(server)
+                continue
+            if idle_for > self.health_check_after:
+                try:
+                    healthy = server.noop()[0] == 250
+                except Exception:
+                    healthy = False
+                if not healthy:
+                    self.health_check_failures += 1
+                    self._close(server)
+                    continue
+
+            self.reuses += 1
+            return server
+
+        return self._connect()
+
+    def _release(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    def _release_or_close(self, server: smtplib.SMTP, error: Exception) -> None:
+        """
+        After a failed send: keep the connection if the server only refused
+        this message (421 means it is closing the session), otherwise close it
+        """
+        if isinstance(error, REPLY_ERRORS) and getattr(error, "smtp_code", None) != 421:
+            try:
+                if server.rset()[0] == 250:
+                    self._release(server)
+                    return
+            except Exception:
+                pass
+        self._close(server)
+
+    def send(self, message: Message) -> None:
+        """
+        Send one message on a pooled connection (blocking; runs on the pool's executor)
+        """
+        with self._slots:
+            self._send(message)
+
+    def _send(self, message: Message) -> None:
+        server = self._acquire()
+        try:
+            self._send_on(server, message)
+        except CONNECTION_ERRORS:
+            # Server dropped the connection before DATA (idle timeout, restart): reconnect once
+            self._close(server)
+            self.reconnects += 1
+            server = self._connect()
+            try:
+                self._send_on(server, message)
+            except Exception as e:
+                self._release_or_close(server, e)
+                self.failed += 1
+                raise
+        except Exception as e:
+            self._release_or_close(server, e)
+            self.failed += 1
+            raise
+
+        self.sent += 1
+        self._release(server)
+
+    @staticmethod
+    def _send_on(server: smtplib.SMTP, message: Message) -> None:
+        server.data_started = False
+        try:
+            server.send_message(message)
+        except CONNECTION_ERRORS as e:
+            if server.data_started:
+                raise SMTPDeliveryUnknown(f"No reply after DATA: {e!r}") from e
+            raise
+
+    async def send_async(self, message: Message) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), self.send, message)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "recycled": self.recycled,
+            "health_check_failures": self.health_check_failures,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+
+smtp_pool = SMTPConnectionPool(
+    size=settings.SMTP_POOL_SIZE,
+    idle_timeout=settings.SMTP_POOL_IDLE_TIMEOUT_SECONDS,
+    health_check_after=settings.SMTP_POOL_HEALTH_CHECK_AFTER_SECONDS,
+)
@@ -0,0 +1,61 @@
+import math
+import time
+from typing import Dict, Hashable, List, Optional
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel for expiring keys.
+    Scheduling and cancelling are O(1); advancing only visits the slots for the
+    ticks that elapsed, so expiry costs O(expired) rather than a scan of every key.
+    Deadlines further out than one revolution simply stay in their slot until
+    their tick comes round.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._deadlines: Dict[Hashable, int] = {}
+        self._current_tick = self._tick_at(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def _tick_at(self, moment: float) -> int:
+        return int(moment / self.tick_seconds)
+
+    def schedule(self, key: Hashable, delay_seconds: float) -> None:
+        self.cancel(key)
+        deadline = math.ceil((time.monotonic() + delay_seconds) / self.tick_seconds)
+        self._slots[deadline % len(self._slots)][key] = deadline
+        self._deadlines[key] = deadline
+
+    def cancel(self, key: Hashable) -> None:
+        deadline = self._deadlines.pop(key, None)
+        if deadline is not None:
+            self._slots[deadline % len(self._slots)].pop(key, None)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Move the wheel to `now` and return the keys whose deadline has passed
+        """
+        target = self._tick_at(time.monotonic() if now is None else now)
+        if target <= self._current_tick:
+            return []
+
+        slot_count = len(self._slots)
+        if target - self._current_tick >= slot_count:
+            visit = range(slot_count)
+        else:
+            visit = (tick % slot_count for tick in range(self._current_tick + 1, target + 1))
+        self._current_tick = target
+
+        expired = []
+        for index in visit:
+            slot = self._slots[index]
+            due = [key for key, deadline in slot.items() if deadline <= target]
+            for key in due:
+                del slot[key]
+                del self._deadlines[key]
+            expired.extend(due)
+        return expired
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.seed.models import AppVersion
+from app.utils.logger import log_info, log_error
+
+
+class AppVersionCache:
+    """
+    In-process app_type -> minimum build_number table used by VersionMiddleware.
+    Loaded at startup, refreshed in the background once the TTL elapses and
+    invalidated explicitly whenever app_versions changes.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._invalidated = False
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh_ms: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None or self._invalidated:
+            return True
+        return (time.monotonic() - self._loaded_at) >= self.ttl_seconds
+
+    async def load(self) -> None:
+        """
+        Reload the whole app_versions table. Concurrent callers share one query.
+        """
+        requested_at = time.monotonic()
+        async with self._lock:
+            if self._loaded_at is not None and self._loaded_at >= requested_at and not self._invalidated:
+                # Another caller refreshed while we were waiting for the lock
+                return
+
+            start = time.perf_counter()
+            try:
+                Session = get_sessionmaker()
+                async with Session() as session:
+                    result = await session.execute(
+                        select(AppVersion.app_type, AppVersion.build_number)
+                    )
+                    versions: Dict[str, int] = {}
+                    for app_type, build_number in result.all():
+                        # Several rows per app_type: the highest one is the minimum allowed build
+                        versions[app_type] = max(build_number, versions.get(app_type, build_number))
+
+                self._versions = versions
+                self._loaded_at = time.monotonic()
+                self._invalidated = False
+                self.refreshes += 1
+                self.last_refresh_ms = (time.perf_counter() - start) * 1000
+                log_info(f"App version cache refreshed in {self.last_refresh_ms:.2f}ms ({len(versions)} app types)")
+            except Exception as e:
+                self.refresh_failures += 1
+                log_error(f"Failed to refresh app version cache: {e}")
+                raise
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_quietly())
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            # Already logged; keep serving the previous table until the next attempt
+            pass
+
+    async def get_min_build_number(self, app_type: str) -> Optional[int]:
+        """
+        Return the minimum build number for an app_type, or None if unknown.
+        Only the very first call (before startup loaded the table) touches the DB;
+        stale entries are served while a background refresh runs.
+        """
+        if not self.is_loaded:
+            await self.load()
+        elif self.is_stale():
+            self._schedule_refresh()
+
+        build_number = self._versions.get(app_type)
+        if build_number is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return build_number
+
+    def invalidate(self) -> None:
+        """
+        Mark the table stale after app_versions changes; the next lookup refreshes it.
+        """
+        self._invalidated = True
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "app_types": len(self._versions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "last_refresh_ms": round(self.last_refresh_ms, 3) if self.last_refresh_ms is not None else None,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+app_version_cache = AppVersionCache(ttl_seconds=settings.APP_VERSION_CACHE_TTL_SECONDS)
@@ -0,0 +1,59 @@
+"""
+Email template render time: precompiled segments vs. substituting the raw source per call.
+
+The naive path re-runs placeholder substitution over the whole template and
+re-derives the plain-text part on every send, which is what rendering costs
+without the compiled cache.
+
+    python -m benchmarks.email_templates --renders 20000
+"""
+import argparse
+import html
+import time
+
+from app.utils.email_templates import PLACEHOLDER, EmailTemplateEngine, html_to_text
+from app.core.config import settings
+
+CONTEXTS = {
+    "otp.html": {"subject": "Verify Your Email - MedVault", "otp_code": "483920"},
+    "welcome.html": {"subject": "Welcome to MedVault!", "first_name": "Nimal"},
+    "password_reset.html": {
+        "subject": "Reset Your Password - MedVault",
+        "reset_url": "https://app.medvault.lk/reset-password?token=Zm9vYmFyYmF6cXV4",
+    },
+}
+
+
+def render_naive(source: str, context: dict) -> tuple[str, str]:
+    html_content = PLACEHOLDER.sub(lambda m: html.escape(str(context[m.group(1)])), source)
+    text_content = PLACEHOLDER.sub(lambda m: str(context[m.group(1)]), html_to_text(source))
+    return html_content, text_content
+
+
+def timed(renders: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(renders):
+        func()
+    return (time.perf_counter() - start) * 1e6 / renders
+
+
+def main(renders: int):
+    engine = EmailTemplateEngine(settings.EMAIL_TEMPLATES_DIR, auto_reload=False)
+    engine.preload()
+
+    for name, context in CONTEXTS.items():
+        source = (engine.directory / name).read_text(encoding="utf-8")
+        template = engine.get(name)
+        naive_us = timed(renders, lambda: render_naive(source, context))
+        compiled_us = timed(renders, lambda: engine.render(name, **context))
+        print(
+            f"{name:<22} {len(source):6d} bytes  placeholders={len(template.html.placeholders)}  "
+            f"naive={naive_us:8.2f}us  compiled={compiled_us:6.2f}us  ({naive_us / compiled_us:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.renders)
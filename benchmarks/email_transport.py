@@ -0,0 +1,84 @@
+"""
+Email load test: smtplib on the thread pool vs. the native asyncio transport.
+
+Runs benchmarks.fake_smtp in a subprocess (so its CPU is not counted) and
+pushes --emails OTP emails through EmailUtils.send_email_async on each
+transport. Reports wall-clock throughput and emails per CPU-second of this
+process, i.e. emails/sec/core.
+
+    python -m benchmarks.email_transport --emails 2000 --connections 4 --latency-ms 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.utils.async_smtp import AsyncSMTPPool
+from app.utils import email_utils
+from app.utils.email_utils import EmailUtils
+from app.utils.smtp_pool import SMTPConnectionPool
+
+HTML = "<p>Your verification code is <b>123456</b></p>" * 40
+
+
+async def start_fake_server(port: int, latency_ms: float, handshake_ms: float) -> asyncio.subprocess.Process:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.fake_smtp",
+        "--port", str(port), "--latency-ms", str(latency_ms), "--handshake-ms", str(handshake_ms),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    await process.stdout.readline()  # "listening on ..."
+    return process
+
+
+async def run(transport: str, emails: int) -> tuple[float, float]:
+    settings.EMAIL_TRANSPORT = transport
+    await EmailUtils.send_email_async("warmup@example.com", "Warm-up", HTML, "123456")
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    results = await asyncio.gather(
+        *(EmailUtils.send_email_async(f"user{i}@example.com", "Verify Your Email - MedVault", HTML, "123456") for i in range(emails))
+    )
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    assert all(results), f"{results.count(False)} emails failed"
+    return wall, cpu
+
+
+async def main(emails: int, connections: int, port: int, latency_ms: float, handshake_ms: float):
+    server = await start_fake_server(port, latency_ms, handshake_ms)
+    settings.SMTP_SERVER = "127.0.0.1"
+    settings.SMTP_PORT = port
+    settings.SMTP_USERNAME = "bench"
+    settings.SMTP_PASSWORD = "bench"
+    settings.SMTP_ALLOW_PLAINTEXT = True
+
+    # Fresh pools sized for this run
+    email_utils.smtp_pool = SMTPConnectionPool(size=connections, idle_timeout=60, health_check_after=10)
+    email_utils.async_smtp_pool = AsyncSMTPPool(
+        size=connections, max_batch=settings.SMTP_PIPELINE_MAX_BATCH, idle_timeout=60, health_check_after=10
+    )
+
+    try:
+        for transport in ("thread", "async"):
+            wall, cpu = await run(transport, emails)
+            print(
+                f"{transport:<8} x{connections}  {wall:7.2f}s  {emails / wall:9.1f} emails/s  "
+                f"cpu={cpu:6.2f}s  {emails / cpu:9.1f} emails/s/core"
+            )
+    finally:
+        await asyncio.to_thread(email_utils.smtp_pool.close)
+        await email_utils.async_smtp_pool.close()
+        server.terminate()
+        await server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--port", type=int, default=2526)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.emails, args.connections, args.port, args.latency_ms, args.handshake_ms))
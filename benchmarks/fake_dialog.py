@@ -0,0 +1,127 @@
+"""
+Minimal local stand-in for the Dialog SMS API, for benchmarks and load tests.
+
+POST /api/v1/login returns a random bearer token valid for --token-ttl
+seconds (reported as expires_in); POST /api/v2/sms accepts a message for a
+valid token and answers 401 otherwise. Messages are recorded in memory.
+--latency-ms delays every response; --error-rate answers that fraction of
+SMS requests with a 503.
+
+    python -m benchmarks.fake_dialog --port 8089 --latency-ms 30 --token-ttl 300 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+LOGIN_PATH = "/api/v1/login"
+SMS_PATH = "/api/v2/sms"
+
+
+class FakeDialogServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        token_ttl: float = 3600.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.token_ttl = token_ttl
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._tokens: Dict[str, float] = {}  # token -> expiry (monotonic)
+        self._runner: Optional[web.AppRunner] = None
+
+        # Recorded traffic
+        self.logins = 0
+        self.unauthorized = 0
+        self.errors = 0
+        self.messages: List[Tuple[str, str]] = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _delay(self) -> None:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    async def login(self, request: web.Request) -> web.Response:
+        await self._delay()
+        body = await request.json()
+        if not body.get("username") or not body.get("password"):
+            return web.json_response({"error": "invalid credentials"}, status=401)
+
+        token = secrets.token_urlsafe(24)
+        self._tokens[token] = time.monotonic() + self.token_ttl
+        self.logins += 1
+        return web.json_response({"access_token": token, "expires_in": self.token_ttl})
+
+    async def send_sms(self, request: web.Request) -> web.Response:
+        await self._delay()
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if self._tokens.get(token, 0) <= time.monotonic():
+            self.unauthorized += 1
+            return web.json_response({"error": "token expired or invalid"}, status=401)
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"error": "service unavailable"}, status=503)
+
+        body = await request.json()
+        self.messages.append((body["to"], body["message"]))
+        return web.json_response({"status": "queued", "id": len(self.messages)}, status=202)
+
+    def expire_tokens(self) -> None:
+        """Revoke every issued token (the next send gets a 401)"""
+        self._tokens.clear()
+
+    async def start(self) -> int:
+        app = web.Application()
+        app.router.add_post(LOGIN_PATH, self.login)
+        app.router.add_post(SMS_PATH, self.send_sms)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def main(host: str, port: int, latency_ms: float, token_ttl: float, error_rate: float):
+    server = FakeDialogServer(host, port, latency_ms, token_ttl, error_rate)
+    await server.start()
+    print(f"Fake Dialog API listening on {server.base_url}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"logins={server.logins} messages={len(server.messages)} unauthorized={server.unauthorized} errors={server.errors}", flush=True)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=3600.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of SMS requests answered with 503")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.latency_ms, args.token_ttl, args.error_rate))
+    except KeyboardInterrupt:
+        pass
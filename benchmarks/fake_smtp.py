@@ -0,0 +1,211 @@
+"""
+Minimal local stand-in SMTP server for benchmarks and load tests.
+
+Speaks just enough ESMTP for smtplib and the app's transports: EHLO/HELO,
+PIPELINING, AUTH PLAIN (any credentials), MAIL/RCPT/DATA, RSET, NOOP, QUIT,
+and STARTTLS or implicit TLS when given a certificate (--tls-cert/--tls-key).
+Messages are counted and discarded (kept in `recorded` with record=True).
+--latency-ms delays every reply flight (one network round trip);
+--handshake-ms adds to the greeting and AUTH reply to stand in for the TLS
+handshake and credential check of a real relay. --temp-error-rate and
+--perm-error-rate reject that fraction of messages at end of DATA with a
+451 or a 550.
+
+    python -m benchmarks.fake_smtp --port 2525 --latency-ms 20 --handshake-ms 60 --temp-error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import ssl
+from typing import List, Optional, Set
+
+
+class _SMTPSession(asyncio.Protocol):
+    def __init__(self, server: "FakeSMTPServer"):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self._buffer = b""
+        self._in_data = False
+        self._tls = server.implicit_tls
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections += 1
+        self.server._sessions.add(self)
+        self._reply([b"220 fake-smtp ESMTP ready"], extra_ms=self.server.handshake_ms)
+
+    def connection_lost(self, exc):
+        self.server._sessions.discard(self)
+
+    def data_received(self, data: bytes):
+        # Everything that arrived together is one client flight; answer it in one write
+        self._buffer += data
+        replies: List[bytes] = []
+        extra_ms = 0.0
+        close = False
+        while not close:
+            if self._in_data:
+                end = self._buffer.find(b"\r\n.\r\n")
+                if end < 0:
+                    break
+                message, self._buffer = self._buffer[:end + 2], self._buffer[end + 5:]
+                self._in_data = False
+                replies.append(self.server._accept(message))
+                continue
+
+            line, sep, rest = self._buffer.partition(b"\r\n")
+            if not sep:
+                break
+            self._buffer = rest
+            verb = line.split(b" ", 1)[0].upper()
+
+            if verb == b"EHLO":
+                starttls = b"250-STARTTLS\r\n" if self.server.starttls_context and not self._tls else b""
+                replies.append(b"250-fake-smtp\r\n250-PIPELINING\r\n250-8BITMIME\r\n" + starttls + b"250 AUTH PLAIN")
+            elif verb == b"STARTTLS" and self.server.starttls_context and not self._tls:
+                self.transport.write(b"220 2.0.0 Ready to start TLS\r\n")
+                asyncio.ensure_future(self._start_tls())
+                break
+            elif verb == b"HELO":
+                replies.append(b"250 fake-smtp")
+            elif verb == b"AUTH":
+                extra_ms += self.server.handshake_ms
+                replies.append(b"235 2.7.0 Authentication successful")
+            elif verb in (b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                replies.append(b"250 2.0.0 OK")
+            elif verb == b"DATA":
+                self._in_data = True
+                replies.append(b"354 End data with <CR><LF>.<CR><LF>")
+            elif verb == b"QUIT":
+                replies.append(b"221 2.0.0 Bye")
+                close = True
+            else:
+                replies.append(b"502 5.5.2 Command not recognized")
+
+        if replies:
+            self._reply(replies, extra_ms=extra_ms, close=close)
+
+    async def _start_tls(self):
+        loop = asyncio.get_running_loop()
+        self.transport = await loop.start_tls(self.transport, self, self.server.starttls_context, server_side=True)
+        self._tls = True
+
+    def _reply(self, replies: List[bytes], extra_ms: float = 0.0, close: bool = False):
+        payload = b"\r\n".join(replies) + b"\r\n"
+        delay = (self.server.latency_ms + extra_ms) / 1000
+        loop = asyncio.get_running_loop()
+        if delay > 0:
+            loop.call_later(delay, self._write, payload, close)
+        else:
+            self._write(payload, close)
+
+    def _write(self, payload: bytes, close: bool):
+        if self.transport is None or self.transport.is_closing():
+            return
+        self.transport.write(payload)
+        if close:
+            self.transport.close()
+
+
+class FakeSMTPServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        handshake_ms: float = 0.0,
+        tls_cert: Optional[str] = None,
+        tls_key: Optional[str] = None,
+        implicit_tls: bool = False,
+        temp_error_rate: float = 0.0,
+        perm_error_rate: float = 0.0,
+        record: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.handshake_ms = handshake_ms
+        self.implicit_tls = implicit_tls
+        self.starttls_context: Optional[ssl.SSLContext] = None
+        if tls_cert:
+            self.starttls_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            self.starttls_context.load_cert_chain(tls_cert, tls_key)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions: Set[_SMTPSession] = set()
+        self.temp_error_rate = temp_error_rate
+        self.perm_error_rate = perm_error_rate
+        self.record = record
+        self._random = random.Random(seed)
+
+        # Counters
+        self.connections = 0
+        self.messages = 0
+        self.rejected = 0
+        self.recorded: List[bytes] = []
+
+    def _accept(self, message: bytes) -> bytes:
+        roll = self._random.random()
+        if roll < self.temp_error_rate:
+            self.rejected += 1
+            return b"451 4.3.0 Temporary failure, try again later"
+        if roll < self.temp_error_rate + self.perm_error_rate:
+            self.rejected += 1
+            return b"550 5.7.1 Message rejected"
+        self.messages += 1
+        if self.record:
+            self.recorded.append(message)
+        return b"250 2.0.0 OK: queued"
+
+    async def start(self) -> int:
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _SMTPSession(self),
+            self.host,
+            self.port,
+            ssl=self.starttls_context if self.implicit_tls else None,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for session in list(self._sessions):
+                if session.transport is not None:
+                    session.transport.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def main(args):
+    server = FakeSMTPServer(
+        args.host, args.port, args.latency_ms, args.handshake_ms, args.tls_cert, args.tls_key, args.implicit_tls,
+        args.temp_error_rate, args.perm_error_rate,
+    )
+    await server.start()
+    print(f"Fake SMTP server listening on {args.host}:{server.port}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"connections={server.connections} messages={server.messages} rejected={server.rejected}", flush=True)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    parser.add_argument("--tls-cert", help="PEM certificate; enables STARTTLS")
+    parser.add_argument("--tls-key", help="PEM private key for --tls-cert")
+    parser.add_argument("--implicit-tls", action="store_true", help="TLS from the first byte (SMTP_SSL) instead of STARTTLS")
+    parser.add_argument("--temp-error-rate", type=float, default=0.0, help="fraction of messages answered with 451")
+    parser.add_argument("--perm-error-rate", type=float, default=0.0, help="fraction of messages answered with 550")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,53 @@
+"""
+JWTUtils.verify_token cost with and without the verified-token cache.
+
+Simulates --users clients each sending --calls authenticated requests with
+the same access token, and reports per-call latency plus the cache hit ratio.
+
+    python -m benchmarks.jwt_cache --users 1000 --calls 20
+"""
+import argparse
+import statistics
+import time
+
+from app.utils.jwt_utils import JWTUtils, verified_token_cache
+
+
+def run(tokens: list[str], calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        for token in tokens:
+            start = time.perf_counter()
+            JWTUtils.decode_token(token)
+            samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    return f"mean={statistics.fmean(samples):7.2f}us  p50={statistics.median(samples):7.2f}us  p99={p99:7.2f}us"
+
+
+def main(users: int, calls: int):
+    tokens = [JWTUtils.create_access_token({"sub": str(i), "email": f"user{i}@medvault.test"}) for i in range(users)]
+
+    max_size = verified_token_cache.max_size
+    verified_token_cache.max_size = 0
+    uncached = run(tokens, calls)
+    print(f"uncached  {summarize(uncached)}")
+
+    verified_token_cache.max_size = max_size
+    verified_token_cache.clear()
+    verified_token_cache.hits = verified_token_cache.misses = 0
+    cached = run(tokens, calls)
+    print(f"cached    {summarize(cached)}")
+    print(f"cache     {verified_token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+    main(args.users, args.calls)
@@ -0,0 +1,102 @@
+"""
+Round-trips, commits and latency of the login write phase.
+
+Compares the per-call-commit sequence (reset_login_attempts, update_last_login,
+store_refresh_token, each committing on its own) against AuthService.record_login,
+which stages the same writes in one unit of work. Runs against DATABASE_URL and
+creates a throwaway bench user if needed.
+
+    python -m benchmarks.login_transaction --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app.core.database import get_engine, get_sessionmaker
+from app.modules.auth.services import AuthService
+from app.modules.user.models import User
+from app.modules.user.repositories import UserRepository
+from app.utils.jwt_utils import JWTUtils
+
+BENCH_EMAIL = "bench-login@medvault.test"
+EXPIRES = timedelta(days=30)
+
+
+class RoundTripCounter:
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+
+async def get_bench_user_id() -> int:
+    async with get_sessionmaker()() as session:
+        repo = UserRepository(session)
+        user = await repo.get_by_email(BENCH_EMAIL)
+        if user is None:
+            user = await repo.create_user(User(
+                email=BENCH_EMAIL, password_hash="-", full_name="Bench User", nic="000000000V", sign_up_method=1,
+            ))
+        return user.id
+
+
+async def per_call_commits(user_id: int, refresh_token: str):
+    async with get_sessionmaker()() as session:
+        repo = UserRepository(session)
+        await repo.reset_login_attempts(user_id)
+        await repo.update_last_login(user_id)
+        await repo.store_refresh_token(user_id, refresh_token, "bench", "127.0.0.1", EXPIRES)
+
+
+async def unit_of_work(user_id: int, refresh_token: str):
+    async with get_sessionmaker()() as session:
+        await AuthService(session).record_login(user_id, refresh_token, EXPIRES, "bench", "127.0.0.1")
+
+
+async def measure(label: str, write_phase, user_id: int, logins: int, counter: RoundTripCounter):
+    counter.reset()
+    samples = []
+    for i in range(logins):
+        token = JWTUtils.create_refresh_token({"sub": str(user_id), "jti": f"{label}-{i}-{time.time_ns()}"}, EXPIRES)
+        start = time.perf_counter()
+        await write_phase(user_id, token)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<18} statements/login={counter.statements / logins:4.1f}  commits/login={counter.commits / logins:4.1f}  "
+        f"p50={statistics.median(samples):7.2f}ms  p95={p95:7.2f}ms"
+    )
+
+
+async def main(logins: int):
+    engine = get_engine()
+    counter = RoundTripCounter(engine)
+    user_id = await get_bench_user_id()
+
+    await measure("per-call commits", per_call_commits, user_id, logins, counter)
+    await measure("unit of work", unit_of_work, user_id, logins, counter)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,108 @@
+"""
+/master-data latency and bytes: per-request SELECT + validate + encode vs.
+the snapshot vs. a conditional GET answered with 304.
+
+Drives the ASGI app in-process against the configured (seeded) database.
+"query" mounts the previous handlers, which run MasterDataService on every
+request; "snapshot" is the real router serving pre-encoded bytes;
+"304" repeats the request with If-None-Match set to the returned ETag, as a
+client with a cached copy does.
+
+    python -m benchmarks.master_data --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, get_engine
+from app.modules.master_data import controllers
+from app.modules.master_data.services import MasterDataService
+from app.modules.master_data.snapshot import master_data_snapshot
+
+
+def build_app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(controllers.router)
+
+    @app.get("/query/master-data/all")
+    async def query_all(db: AsyncSession = Depends(get_db)):
+        return await MasterDataService(db).get_all_master_data()
+
+    @app.get("/query/master-data/{data_type}")
+    async def query_one(data_type: str, db: AsyncSession = Depends(get_db)):
+        return await MasterDataService(db).get_master_data_by_type(data_type)
+
+    return app
+
+
+async def call(app, path: str, headers: list = ()) -> tuple[int, int, dict]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), *headers], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    status, size, response_headers = 0, 0, {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size, response_headers
+
+
+async def measure(app, path: str, requests: int, headers: list = ()) -> tuple[list[float], int]:
+    for _ in range(20):
+        await call(app, path, headers)
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        status, size, _ = await call(app, path, headers)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+        assert status in (200, 304), f"GET {path} returned {status}"
+    return samples, size
+
+
+def summarize(samples: list[float], size: int) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"mean={statistics.fmean(samples):9.1f}us  p50={statistics.median(samples):9.1f}us  p95={p95:9.1f}us  body={size:7d}B"
+
+
+async def main(requests: int):
+    app = build_app()
+    await master_data_snapshot.build()
+    try:
+        for path in ("/master-data/all", "/master-data/genders"):
+            print(f"GET {path}")
+            for label, prefix in (("query", "/query"), ("snapshot", "")):
+                samples, size = await measure(app, prefix + path, requests)
+                print(f"  {label:<10} {summarize(samples, size)}")
+
+            _, full_size, response_headers = await call(app, path)
+            conditional = [(b"if-none-match", response_headers["etag"].encode())]
+            samples, size = await measure(app, path, requests, conditional)
+            print(f"  {'304':<10} {summarize(samples, size)}  saved={full_size - size}B/request "
+                  f"({response_headers['cache-control']})")
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,127 @@
+"""
+Per-request overhead of the HTTP logging and version-check middleware.
+
+Drives the ASGI app in-process (no sockets, no DB) with stub routes mounted at
+/auth/login and /master-data/all, and compares a bare app against the same app
+wrapped in HTTPLoggerMiddleware + VersionMiddleware.
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+
+from app.middleware.http_logger import HTTPLoggerMiddleware
+from app.middleware.version_middleware import VersionMiddleware
+from app.utils.version_cache import app_version_cache
+
+LOGIN_BODY = b'{"email": "bench@medvault.test", "password": "Password123"}'
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.post("/auth/login")
+    async def login(request: Request):
+        await request.body()
+        return {"success": True}
+
+    @app.get("/master-data/all")
+    async def master_data():
+        return {"success": True, "data": {"genders": [{"id": 1, "gender": "male"}]}}
+
+    if with_middleware:
+        app.add_middleware(HTTPLoggerMiddleware)
+        app.add_middleware(VersionMiddleware)
+    return app
+
+
+def make_scope(method: str, path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"app_type", b"android"),
+            (b"build_number", b"100"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def call(app, method: str, path: str, body: bytes) -> int:
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(make_scope(method, path), receive, send)
+    return status
+
+
+async def measure(app, method: str, path: str, body: bytes, requests: int) -> list[float]:
+    # Warm up routing / middleware stack construction
+    for _ in range(200):
+        await call(app, method, path, body)
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        status = await call(app, method, path, body)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+        assert status == 200, f"{method} {path} returned {status}"
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"mean={statistics.fmean(samples):8.1f}us  p50={statistics.median(samples):8.1f}us  p95={p95:8.1f}us"
+
+
+async def main(requests: int):
+    # Serve the version gate from memory, as it is after startup
+    app_version_cache._versions = {"android": 1}
+    app_version_cache._loaded_at = time.monotonic() + 10**9
+
+    bare = build_app(with_middleware=False)
+    wrapped = build_app(with_middleware=True)
+
+    for method, path, body in (("POST", "/auth/login", LOGIN_BODY), ("GET", "/master-data/all", b"")):
+        bare_samples = await measure(bare, method, path, body, requests)
+        wrapped_samples = await measure(wrapped, method, path, body, requests)
+        overhead = statistics.fmean(wrapped_samples) - statistics.fmean(bare_samples)
+        print(f"{method} {path}")
+        print(f"  bare        {summarize(bare_samples)}")
+        print(f"  middleware  {summarize(wrapped_samples)}")
+        print(f"  overhead    {overhead:8.1f}us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
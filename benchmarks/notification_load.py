@@ -0,0 +1,115 @@
+"""
+Notification load test: OTP email and SMS through the local stand-in providers.
+
+Starts benchmarks.fake_smtp and benchmarks.fake_dialog in-process, then
+drives --requests EmailUtils.send_otp_email and SMSUtils.send_otp_sms calls
+with --concurrency in flight per channel. Reports throughput, failures and
+p50/p95/p99 latency per channel. Faults are injected with --smtp-error-rate
+(451s), --sms-error-rate (503s) and --token-ttl (Dialog token expiry).
+
+    python -m benchmarks.notification_load --requests 1000 --concurrency 50 --latency-ms 20 --token-ttl 5
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from app.core.config import settings
+from app.utils import email_utils, sms_utils
+from app.utils.async_smtp import AsyncSMTPPool
+from app.utils.email_utils import EmailUtils
+from app.utils.sms_utils import DialogClient, SMSUtils
+from benchmarks.fake_dialog import FakeDialogServer, LOGIN_PATH, SMS_PATH
+from benchmarks.fake_smtp import FakeSMTPServer
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def drive(name: str, requests: int, concurrency: int, send: Callable[[int], Awaitable[bool]]) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with slots:
+            start = time.perf_counter()
+            ok = await send(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            failures += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<6} {requests / elapsed:8.1f} req/s  failed={failures:<5} "
+        f"p50={percentile(latencies, 50):7.1f}ms  p95={percentile(latencies, 95):7.1f}ms  p99={percentile(latencies, 99):7.1f}ms"
+    )
+
+
+async def main(args):
+    smtp = FakeSMTPServer(latency_ms=args.latency_ms, handshake_ms=args.handshake_ms, temp_error_rate=args.smtp_error_rate, seed=1)
+    dialog = FakeDialogServer(latency_ms=args.latency_ms, token_ttl=args.token_ttl, error_rate=args.sms_error_rate, seed=1)
+    await smtp.start()
+    await dialog.start()
+
+    settings.EMAIL_TRANSPORT = "async"
+    settings.SMTP_SERVER = "127.0.0.1"
+    settings.SMTP_PORT = smtp.port
+    settings.SMTP_USERNAME = "load"
+    settings.SMTP_PASSWORD = "load"
+    settings.SMTP_ALLOW_PLAINTEXT = True
+    settings.EMAIL_FROM_ADDRESS = settings.EMAIL_FROM_ADDRESS or "no-reply@medvault.local"
+    settings.DIALOG_BASE_URL = dialog.base_url
+    settings.DIALOG_USERNAME = "load"
+    settings.DIALOG_PASSWORD = "load"
+    settings.DIALOG_LOGIN_ENDPOINT = LOGIN_PATH
+    settings.DIALOG_SMS_ENDPOINT = SMS_PATH
+
+    email_utils.async_smtp_pool = AsyncSMTPPool(
+        size=args.smtp_connections, max_batch=settings.SMTP_PIPELINE_MAX_BATCH, idle_timeout=60, health_check_after=10
+    )
+    # Refresh margin scaled down so short --token-ttl values still exercise reuse
+    sms_utils.dialog_client = DialogClient(
+        pool_size=args.concurrency, timeout=10, token_ttl=3000, refresh_margin=min(60, args.token_ttl / 10),
+        max_concurrency=args.concurrency, rate_limit=args.sms_rate_limit,
+    )
+
+    try:
+        await drive(
+            "email", args.requests, args.concurrency,
+            lambda i: EmailUtils.send_otp_email(f"user{i}@example.com", f"{i % 1000000:06d}", "verification"),
+        )
+        await drive(
+            "sms", args.requests, args.concurrency,
+            lambda i: SMSUtils.send_otp_sms(f"077{i:07d}", f"{i % 1000000:06d}", "verification"),
+        )
+        client = sms_utils.dialog_client.stats()
+        print(
+            f"smtp: connections={smtp.connections} accepted={smtp.messages} rejected={smtp.rejected}\n"
+            f"dialog: logins={dialog.logins} accepted={len(dialog.messages)} 401s={dialog.unauthorized} "
+            f"503s={dialog.errors} client_retries={client['unauthorized_retries']}"
+        )
+    finally:
+        await email_utils.async_smtp_pool.close()
+        await sms_utils.dialog_client.close()
+        await dialog.stop()
+        await smtp.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--handshake-ms", type=float, default=60.0)
+    parser.add_argument("--smtp-connections", type=int, default=4)
+    parser.add_argument("--smtp-error-rate", type=float, default=0.0)
+    parser.add_argument("--sms-error-rate", type=float, default=0.0)
+    parser.add_argument("--sms-rate-limit", type=float, default=0.0, help="0 = unlimited")
+    parser.add_argument("--token-ttl", type=float, default=3600.0, help="Dialog token lifetime in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,71 @@
+"""
+Login-style bcrypt throughput and event-loop lag, inline vs. on the hash pool.
+
+Runs --logins concurrent verify_password calls and samples event-loop lag
+while they run, first inline on the loop (the old behavior) and then through
+PasswordHashPool with 1..N workers.
+
+    python -m benchmarks.password_hashing --logins 64 --rounds 10
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import bcrypt
+
+from app.utils.loop_monitor import EventLoopLagMonitor
+from app.utils.password_utils import PasswordHashPool, PasswordUtils
+
+PASSWORD = "Password123"
+
+
+async def run_inline(hashed: str, logins: int) -> float:
+    async def login():
+        PasswordUtils.verify_password(PASSWORD, hashed)
+        await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - start
+
+
+async def run_pool(pool: PasswordHashPool, hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.run(PasswordUtils.verify_password, PASSWORD, hashed) for _ in range(logins)))
+    return time.perf_counter() - start
+
+
+async def measure(label: str, runner) -> None:
+    monitor = EventLoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    elapsed = await runner()
+    await monitor.stop()
+    print(
+        f"{label:<22} {elapsed:7.2f}s  {args.logins / elapsed:8.1f} logins/s  "
+        f"loop lag avg={monitor.avg_lag_ms:8.1f}ms max={monitor.max_lag_ms:8.1f}ms"
+    )
+
+
+async def main():
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=args.rounds)).decode()
+
+    await measure("inline (event loop)", lambda: run_inline(hashed, args.logins))
+
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, max(cores // 2, 1), cores})
+    for kind in ("thread", "process"):
+        for count in workers:
+            pool = PasswordHashPool(kind=kind, workers=count, max_concurrency=args.logins, queue_timeout=60)
+            await pool.run(PasswordUtils.verify_password, PASSWORD, hashed)  # warm up workers
+            await measure(f"{kind} x{count}", lambda: run_pool(pool, hashed, args.logins))
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Refresh-token lookup latency and index size: VARCHAR(500) UNIQUE vs BINARY(32) digest.
+
+Builds two scratch tables in the configured MySQL database, loads --rows
+JWT-shaped tokens into each, then times random point lookups and reads
+index sizes from mysql.innodb_index_stats. Loading tens of millions of rows
+takes a while; use --keep to reuse the tables across runs.
+
+    python -m benchmarks.refresh_token_index --rows 20000000 --lookups 20000
+"""
+import argparse
+import asyncio
+import base64
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import get_engine
+from app.utils.jwt_utils import JWTUtils
+
+JWT_HEADER = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9."
+TABLES = {
+    "bench_refresh_tokens_varchar": (
+        "CREATE TABLE IF NOT EXISTS `bench_refresh_tokens_varchar` ("
+        "`id` INT AUTO_INCREMENT PRIMARY KEY, `token` VARCHAR(500) NOT NULL UNIQUE)",
+        "INSERT INTO `bench_refresh_tokens_varchar` (`token`) VALUES (:token)",
+        "SELECT `id` FROM `bench_refresh_tokens_varchar` WHERE `token` = :token",
+    ),
+    "bench_refresh_tokens_hash": (
+        "CREATE TABLE IF NOT EXISTS `bench_refresh_tokens_hash` ("
+        "`id` INT AUTO_INCREMENT PRIMARY KEY, `token_hash` BINARY(32) NOT NULL UNIQUE)",
+        "INSERT INTO `bench_refresh_tokens_hash` (`token_hash`) VALUES (:token)",
+        "SELECT `id` FROM `bench_refresh_tokens_hash` WHERE `token_hash` = :token",
+    ),
+}
+
+
+def make_token(seed: int) -> str:
+    # Same shape as a real refresh token: shared header, ~200 chars total
+    rng = random.Random(seed)
+    body = base64.urlsafe_b64encode(rng.randbytes(120)).decode().rstrip("=")
+    signature = base64.urlsafe_b64encode(rng.randbytes(32)).decode().rstrip("=")
+    return f"{JWT_HEADER}{body}.{signature}"
+
+
+def key_for(table: str, token: str):
+    return JWTUtils.hash_token(token) if table.endswith("_hash") else token
+
+
+async def load(conn, table: str, insert_sql: str, rows: int, batch_size: int):
+    existing = (await conn.execute(text(f"SELECT COUNT(*) FROM `{table}`"))).scalar()
+    for start in range(existing, rows, batch_size):
+        batch = [{"token": key_for(table, make_token(i))} for i in range(start, min(start + batch_size, rows))]
+        await conn.execute(text(insert_sql), batch)
+        await conn.commit()
+    await conn.execute(text(f"ANALYZE TABLE `{table}`"))
+
+
+async def index_size_mb(conn, table: str) -> float:
+    result = await conn.execute(
+        text(
+            "SELECT SUM(stat_value) * @@innodb_page_size FROM mysql.innodb_index_stats "
+            "WHERE database_name = DATABASE() AND table_name = :table "
+            "AND stat_name = 'size' AND index_name <> 'PRIMARY'"
+        ),
+        {"table": table},
+    )
+    return float(result.scalar() or 0) / (1024 * 1024)
+
+
+async def lookups(conn, table: str, select_sql: str, rows: int, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        token = key_for(table, make_token(random.randrange(rows)))
+        start = time.perf_counter()
+        found = (await conn.execute(text(select_sql), {"token": token})).scalar()
+        samples.append((time.perf_counter() - start) * 1000)
+        assert found is not None
+    return samples
+
+
+async def main(rows: int, lookup_count: int, batch_size: int, keep: bool):
+    engine = get_engine()
+    try:
+        async with engine.connect() as conn:
+            for table, (create_sql, insert_sql, select_sql) in TABLES.items():
+                await conn.execute(text(create_sql))
+                await conn.commit()
+
+                start = time.perf_counter()
+                await load(conn, table, insert_sql, rows, batch_size)
+                load_seconds = time.perf_counter() - start
+
+                samples = sorted(await lookups(conn, table, select_sql, rows, lookup_count))
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                print(
+                    f"{table:<30} rows={rows:>10}  load={load_seconds:8.1f}s  "
+                    f"index={await index_size_mb(conn, table):9.1f}MB  "
+                    f"lookup p50={statistics.median(samples):6.3f}ms p95={p95:6.3f}ms"
+                )
+
+                if not keep:
+                    await conn.execute(text(f"DROP TABLE `{table}`"))
+                    await conn.commit()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables for the next run")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.lookups, args.batch_size, args.keep))
@@ -0,0 +1,61 @@
+"""
+Bulk SMS throughput: one send_sms_dialog call after another vs. send_bulk_sms.
+
+Starts benchmarks.fake_dialog in-process and sends --messages alerts both
+ways. The bulk run honours --concurrency and --rate-limit (0 = unlimited),
+the same limits SMS_MAX_CONCURRENCY / SMS_RATE_LIMIT_PER_SECOND set.
+
+    python -m benchmarks.sms_bulk --messages 200 --concurrency 10 --rate-limit 0 --latency-ms 50
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.utils import sms_utils
+from app.utils.sms_utils import DialogClient, SMSUtils
+from benchmarks.fake_dialog import FakeDialogServer, LOGIN_PATH, SMS_PATH
+
+MESSAGE = "MedVault Security Alert: Password change was performed on your account."
+
+
+async def main(messages: int, concurrency: int, rate_limit: float, latency_ms: float):
+    server = FakeDialogServer(latency_ms=latency_ms)
+    await server.start()
+    settings.DIALOG_BASE_URL = server.base_url
+    settings.DIALOG_USERNAME = "bench"
+    settings.DIALOG_PASSWORD = "bench"
+    settings.DIALOG_LOGIN_ENDPOINT = LOGIN_PATH
+    settings.DIALOG_SMS_ENDPOINT = SMS_PATH
+    sms_utils.dialog_client = DialogClient(
+        pool_size=max(concurrency, 1), timeout=10, token_ttl=3000, refresh_margin=60,
+        max_concurrency=concurrency, rate_limit=rate_limit,
+    )
+    pairs = [(f"077{i:07d}", MESSAGE) for i in range(messages)]
+
+    try:
+        start = time.perf_counter()
+        for phone_number, message in pairs:
+            assert await SMSUtils.send_sms_dialog(phone_number, message)
+        elapsed = time.perf_counter() - start
+        print(f"{'serial send_sms_dialog':<24} {elapsed:7.2f}s  {messages / elapsed:8.1f} msgs/s")
+
+        start = time.perf_counter()
+        results = await SMSUtils.send_bulk_sms(pairs)
+        elapsed = time.perf_counter() - start
+        assert all(result["success"] for result in results)
+        print(f"{'send_bulk_sms':<24} {elapsed:7.2f}s  {messages / elapsed:8.1f} msgs/s  "
+              f"(concurrency={concurrency}, rate_limit={rate_limit or 'off'})")
+    finally:
+        await sms_utils.dialog_client.close()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.rate_limit, args.latency_ms))
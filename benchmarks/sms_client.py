@@ -0,0 +1,79 @@
+"""
+SMS send cost: login + new ClientSession per message vs. the shared DialogClient.
+
+Starts benchmarks.fake_dialog in-process and sends --messages OTP SMS with
+--concurrency in flight, first the old way (a login POST and two fresh
+sessions per message), then through SMSUtils with the cached token.
+
+    python -m benchmarks.sms_client --messages 500 --concurrency 20 --latency-ms 20
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from app.core.config import settings
+from app.utils.sms_utils import DialogClient, SMSUtils
+from app.utils import sms_utils
+from benchmarks.fake_dialog import FakeDialogServer, LOGIN_PATH, SMS_PATH
+
+PHONE = "0771234567"
+MESSAGE = "Your MedVault verification code is: 123456. This code will expire in 5 minutes."
+
+
+async def send_uncached(base_url: str) -> bool:
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base_url}{LOGIN_PATH}", json={"username": "bench", "password": "bench"}) as response:
+            token = (await response.json())["access_token"]
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{base_url}{SMS_PATH}",
+            json={"to": "+94771234567", "message": MESSAGE, "from": "MedVault"},
+            headers={"Authorization": f"Bearer {token}"},
+        ) as response:
+            return response.status == 202
+
+
+async def run(messages: int, concurrency: int, send) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            assert await send()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(messages)))
+    return time.perf_counter() - start
+
+
+async def main(messages: int, concurrency: int, latency_ms: float):
+    server = FakeDialogServer(latency_ms=latency_ms)
+    await server.start()
+    settings.DIALOG_BASE_URL = server.base_url
+    settings.DIALOG_USERNAME = "bench"
+    settings.DIALOG_PASSWORD = "bench"
+    settings.DIALOG_LOGIN_ENDPOINT = LOGIN_PATH
+    settings.DIALOG_SMS_ENDPOINT = SMS_PATH
+    sms_utils.dialog_client = DialogClient(pool_size=concurrency, timeout=10, token_ttl=3000, refresh_margin=60)
+
+    try:
+        logins = server.logins
+        elapsed = await run(messages, concurrency, lambda: send_uncached(server.base_url))
+        print(f"{'login + session per SMS':<26} {elapsed:7.2f}s  {messages / elapsed:8.1f} msgs/s  logins={server.logins - logins}")
+
+        logins = server.logins
+        elapsed = await run(messages, concurrency, lambda: SMSUtils.send_sms_dialog(PHONE, MESSAGE))
+        print(f"{'shared DialogClient':<26} {elapsed:7.2f}s  {messages / elapsed:8.1f} msgs/s  logins={server.logins - logins}")
+    finally:
+        await sms_utils.dialog_client.close()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.latency_ms))
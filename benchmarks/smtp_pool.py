@@ -0,0 +1,92 @@
+"""
+Email throughput: a fresh SMTP connection per message vs. the shared SMTPConnectionPool.
+
+Starts benchmarks.fake_smtp in-process and sends --emails OTP-sized messages
+through each transport, with the same number of simultaneous connections to
+the server on both sides. The per-message path reproduces the old EmailUtils
+behavior (new executor, connect + AUTH, one message, QUIT).
+
+    python -m benchmarks.smtp_pool --emails 200 --latency-ms 5 --handshake-ms 40
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.utils.email_utils import EmailUtils
+from app.utils.smtp_pool import SMTPConnectionPool, create_smtp_connection
+from benchmarks.fake_smtp import FakeSMTPServer
+
+
+def make_message(i: int):
+    return EmailUtils._create_message(
+        f"user{i}@example.com", "Verify Your Email - MedVault", "<p>Your code is 123456</p>" * 20, "Your code is 123456"
+    )
+
+
+def send_unpooled(message) -> None:
+    server = create_smtp_connection()
+    server.send_message(message)
+    server.quit()
+
+
+async def run_unpooled(emails: int, concurrency: int) -> float:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(i: int):
+        async with slots:
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor() as executor:
+                await loop.run_in_executor(executor, send_unpooled, make_message(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(emails)))
+    return time.perf_counter() - start
+
+
+async def run_pooled(pool: SMTPConnectionPool, emails: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.send_async(make_message(i)) for i in range(emails)))
+    return time.perf_counter() - start
+
+
+async def main(emails: int, pool_sizes: list[int], latency_ms: float, handshake_ms: float):
+    server = FakeSMTPServer(latency_ms=latency_ms, handshake_ms=handshake_ms)
+    port = await server.start()
+    settings.SMTP_SERVER = "127.0.0.1"
+    settings.SMTP_PORT = port
+    settings.SMTP_USERNAME = "bench"
+    settings.SMTP_PASSWORD = "bench"
+    settings.SMTP_ALLOW_PLAINTEXT = True
+
+    try:
+        for size in pool_sizes:
+            connections = server.connections
+            elapsed = await run_unpooled(emails, size)
+            print(
+                f"{f'per-message x{size}':<20} {elapsed:7.2f}s  {emails / elapsed:8.1f} emails/s  "
+                f"connections={server.connections - connections}"
+            )
+
+            pool = SMTPConnectionPool(size=size, idle_timeout=60, health_check_after=10)
+            connections = server.connections
+            elapsed = await run_pooled(pool, emails)
+            # QUIT needs the fake server, which runs on this loop
+            await asyncio.to_thread(pool.close)
+            print(
+                f"{f'pool x{size}':<20} {elapsed:7.2f}s  {emails / elapsed:8.1f} emails/s  "
+                f"connections={server.connections - connections}"
+            )
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--pool-sizes", default="1,4,8", help="Comma-separated pool sizes to try")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.emails, [int(size) for size in args.pool_sizes.split(",")], args.latency_ms, args.handshake_ms))
@@ -84,7 +84,7 @@ CREATE TABLE IF NOT EXISTS `otp_verifications` (
     `expires_at` DATETIME NOT NULL,
     `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
     `used_at` DATETIME NULL,
-    INDEX `ix_otp_verifications_email` (`email`)
+    INDEX `ix_otp_verifications_lookup` (`email`, `otp_type`, `is_used`, `created_at`, `expires_at`)
 );
 
 -- ==========================================
@@ -93,14 +93,17 @@ CREATE TABLE IF NOT EXISTS `otp_verifications` (
 CREATE TABLE IF NOT EXISTS `refresh_tokens` (
     `id` INT AUTO_INCREMENT PRIMARY KEY,
     `user_id` INT NOT NULL,
-    `token` VARCHAR(500) NOT NULL UNIQUE,
+    `token_hash` BINARY(32) NOT NULL,
+    `token` VARCHAR(500) NULL,
     `is_active` BOOLEAN DEFAULT TRUE NOT NULL,
     `expires_at` DATETIME NOT NULL,
     `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
     `last_used_at` DATETIME NULL,
     `user_agent` VARCHAR(500) NULL,
     `ip_address` VARCHAR(45) NULL,
-    INDEX `ix_refresh_tokens_user_id_is_active` (`user_id`, `is_active`)
+    UNIQUE INDEX `ux_refresh_tokens_token_hash` (`token_hash`),
+    INDEX `ix_refresh_tokens_user_id_is_active` (`user_id`, `is_active`),
+    INDEX `ix_refresh_tokens_is_active_expires_at` (`is_active`, `expires_at`)
 );
 
 -- ==========================================
@@ -117,6 +120,23 @@ CREATE TABLE IF NOT EXISTS `password_reset_tokens` (
     INDEX `ix_password_reset_tokens_user_id` (`user_id`)
 );
 
+-- ==========================================
+-- Table: notification_outbox
+-- ==========================================
+CREATE TABLE IF NOT EXISTS `notification_outbox` (
+    `id` INT AUTO_INCREMENT PRIMARY KEY,
+    `channel` VARCHAR(20) NOT NULL,
+    `template` VARCHAR(50) NOT NULL,
+    `recipient` VARCHAR(255) NOT NULL,
+    `payload` JSON NOT NULL,
+    `status` INT DEFAULT 1 NOT NULL,
+    `attempts` INT DEFAULT 0 NOT NULL,
+    `next_attempt_at` DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    `last_error` TEXT NULL,
+    `created_at` DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    INDEX `ix_notification_outbox_status_next_attempt_at` (`status`, `next_attempt_at`)
+);
+
 -- ==========================================
 -- Table: app_versions
 -- ==========================================
@@ -215,3 +235,77 @@ CREATE TABLE IF NOT EXISTS `genetic_conditions` (
     `condition_name` VARCHAR(255),
     `weight_number` FLOAT DEFAULT 0
 );
+
+-- ==========================================
+-- Table: master_data_changes
+-- Change log behind /master-data/{data_type}?since=<version>, filled by
+-- the triggers below. version comes from master_data_version, whose single
+-- row stays locked until the writing transaction commits, so versions
+-- become visible in order and a client cursor never skips a change.
+-- ==========================================
+CREATE TABLE IF NOT EXISTS `master_data_version` (
+    `id` INT PRIMARY KEY,
+    `version` INT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO `master_data_version` (`id`, `version`) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS `master_data_changes` (
+    `version` INT PRIMARY KEY,
+    `table_name` VARCHAR(64) NOT NULL,
+    `row_id` INT NOT NULL,
+    `operation` CHAR(1) NOT NULL,
+    `changed_at` DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    INDEX `ix_master_data_changes_table_version` (`table_name`, `version`)
+);
+
+-- Change triggers: medical_conditions_suggestions (bump the version, then log the row with it)
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_insert_version` AFTER INSERT ON `medical_conditions_suggestions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_insert_log` AFTER INSERT ON `medical_conditions_suggestions` FOR EACH ROW FOLLOWS `trg_medical_conditions_suggestions_insert_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'medical_conditions_suggestions', NEW.`id`, 'I' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_update_version` AFTER UPDATE ON `medical_conditions_suggestions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_update_log` AFTER UPDATE ON `medical_conditions_suggestions` FOR EACH ROW FOLLOWS `trg_medical_conditions_suggestions_update_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'medical_conditions_suggestions', NEW.`id`, 'U' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_delete_version` AFTER DELETE ON `medical_conditions_suggestions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_medical_conditions_suggestions_delete_log` AFTER DELETE ON `medical_conditions_suggestions` FOR EACH ROW FOLLOWS `trg_medical_conditions_suggestions_delete_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'medical_conditions_suggestions', OLD.`id`, 'D' FROM `master_data_version` WHERE `id` = 1;
+
+-- Change triggers: allergies (bump the version, then log the row with it)
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_insert_version` AFTER INSERT ON `allergies` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_insert_log` AFTER INSERT ON `allergies` FOR EACH ROW FOLLOWS `trg_allergies_insert_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'allergies', NEW.`id`, 'I' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_update_version` AFTER UPDATE ON `allergies` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_update_log` AFTER UPDATE ON `allergies` FOR EACH ROW FOLLOWS `trg_allergies_update_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'allergies', NEW.`id`, 'U' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_delete_version` AFTER DELETE ON `allergies` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_allergies_delete_log` AFTER DELETE ON `allergies` FOR EACH ROW FOLLOWS `trg_allergies_delete_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'allergies', OLD.`id`, 'D' FROM `master_data_version` WHERE `id` = 1;
+
+-- Change triggers: genetic_conditions (bump the version, then log the row with it)
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_insert_version` AFTER INSERT ON `genetic_conditions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_insert_log` AFTER INSERT ON `genetic_conditions` FOR EACH ROW FOLLOWS `trg_genetic_conditions_insert_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'genetic_conditions', NEW.`id`, 'I' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_update_version` AFTER UPDATE ON `genetic_conditions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_update_log` AFTER UPDATE ON `genetic_conditions` FOR EACH ROW FOLLOWS `trg_genetic_conditions_update_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'genetic_conditions', NEW.`id`, 'U' FROM `master_data_version` WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_delete_version` AFTER DELETE ON `genetic_conditions` FOR EACH ROW
+    UPDATE `master_data_version` SET `version` = `version` + 1 WHERE `id` = 1;
+CREATE TRIGGER IF NOT EXISTS `trg_genetic_conditions_delete_log` AFTER DELETE ON `genetic_conditions` FOR EACH ROW FOLLOWS `trg_genetic_conditions_delete_version`
+    INSERT INTO `master_data_changes` (`version`, `table_name`, `row_id`, `operation`)
+    SELECT `version`, 'genetic_conditions', OLD.`id`, 'D' FROM `master_data_version` WHERE `id` = 1;